@@ -0,0 +1,151 @@
+"""
+Multi-Agent Research Assistant - HTTP API
+Exposes the research workflow to other systems.
+
+Run with:
+    uvicorn api_server:app --host 0.0.0.0 --port 8000
+"""
+
+import json
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional
+
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+# Add src to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from src.runs import get_run_manager, warm_up
+from src.utils import open_report
+
+# Seconds between SSE keep-alive comments while a run is quiet
+KEEPALIVE_INTERVAL = 15
+
+
+class ResearchRequest(BaseModel):
+    """Body of a research submission."""
+    topic: str = Field(..., min_length=3, description="Research topic")
+    research_depth: str = Field("standard", pattern="^(quick|standard|deep)$")
+    profile: bool = Field(False, description="Capture a CPU, memory and wait profile of the run")
+    deadline_seconds: Optional[float] = Field(
+        None, gt=0, description="Deliver a report within this many seconds, degrading the run if needed")
+    max_tokens: Optional[int] = Field(None, gt=0, description="LLM token budget of the run")
+    client_id: Optional[str] = Field(
+        None, max_length=128,
+        description="Caller identity; the same client's runs of a topic are joined and resumed")
+    resume_run_id: Optional[str] = Field(None, pattern="^[0-9a-f]{16}$",
+                                         description="Run id of a failed run to continue")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Pre-warm the shared LLM client, configuration and tools before serving."""
+    seconds = warm_up()
+    # Start the run pool now so the async endpoints never create it on the event loop
+    get_run_manager()
+    print(f"✓ API server warmed up in {seconds:.2f}s")
+    yield
+
+
+app = FastAPI(title="Multi-Agent Research Assistant", lifespan=lifespan)
+
+
+def get_handle(run_id):
+    handle = get_run_manager().get(run_id)
+    if handle is None:
+        raise HTTPException(status_code=404, detail=f"Unknown run: {run_id}")
+    return handle
+
+
+@app.get("/health")
+async def health():
+    """Liveness check with run pool statistics (worker startup, dispatch latency)."""
+    return {'status': 'ok', **get_run_manager().stats()}
+
+
+@app.post("/research", status_code=202)
+def submit_research(request: ResearchRequest):
+    """Start a research run in the background (or join the identical run in progress)."""
+    handle = get_run_manager().submit(request.topic, request.research_depth, profile=request.profile,
+                                      deadline_seconds=request.deadline_seconds,
+                                      max_tokens=request.max_tokens, owner=request.client_id,
+                                      resume=request.resume_run_id)
+    return handle.to_dict()
+
+
+@app.get("/research")
+async def list_research():
+    """Status of all tracked runs."""
+    return get_run_manager().list_runs()
+
+
+@app.get("/research/{run_id}")
+async def get_status(run_id: str):
+    """Current status, completed tasks and metrics of a run."""
+    return get_handle(run_id).to_dict()
+
+
+@app.get("/research/{run_id}/events")
+async def stream_events(run_id: str, since: int = 0, last_event_id: str = Header(None)):
+    """
+    Stream progress events as Server-Sent Events.
+
+    The stream ends with a ``status`` event once the run has finished.
+    Reconnecting clients skip events they already received through the
+    ``Last-Event-ID`` header or the ``since`` query parameter. Waiting for
+    events happens on the event loop, so idle streams hold no worker thread.
+    """
+    handle = get_handle(run_id)
+    if last_event_id and last_event_id.isdigit():
+        since = max(since, int(last_event_id))
+
+    async def events():
+        position = since
+        while True:
+            new_events = await handle.wait_for_events_async(position, timeout=KEEPALIVE_INTERVAL)
+            for event in new_events:
+                position += 1
+                yield f"id: {position}\nevent: progress\ndata: {json.dumps(event)}\n\n"
+            if handle.done and position >= len(handle.events):
+                yield f"event: status\ndata: {json.dumps(handle.to_dict())}\n\n"
+                return
+            if not new_events:
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={'Cache-Control': 'no-cache'})
+
+
+@app.get("/research/{run_id}/report")
+def get_report(run_id: str, section: int = None):
+    """
+    Return the report of a completed run as markdown.
+
+    The stored report is streamed section by section; pass ``section`` to
+    fetch a single section (negative values count from the end).
+    """
+    handle = get_handle(run_id)
+    if handle.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Run is {handle.status}")
+
+    reader = open_report(handle.report_path)
+    if section is not None:
+        try:
+            return StreamingResponse(iter([reader.read_section(section)]), media_type="text/markdown")
+        except IndexError:
+            raise HTTPException(status_code=404, detail=f"Unknown section: {section}")
+
+    def sections():
+        for position, (_, content) in enumerate(reader.iter_sections()):
+            yield ("\n\n" if position else "") + content
+
+    return StreamingResponse(sections(), media_type="text/markdown")
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,127 @@
+"""
+Load test for the research API server.
+
+Drives N concurrent clients against a running api_server. Each client
+submits a research run, follows its Server-Sent Events stream until the run
+finishes and downloads the report. Latencies are summarized at the end.
+
+Usage:
+    python scripts/load_run.py --clients 10 --url http://localhost:8000
+    python scripts/load_run.py --clients 20 --topics-file topics.txt --depth quick
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+
+import requests
+
+DEFAULT_TOPICS = [
+    "Current state of quantum computing and its applications in cryptography",
+    "Impact of artificial intelligence on healthcare diagnostics",
+    "Renewable energy technologies and their economic viability",
+    "Evolution of blockchain technology beyond cryptocurrency",
+    "Latest developments in gene therapy and CRISPR technology"
+]
+
+
+def run_client(base_url, topic, depth, results, timeout):
+    """Submit one run, follow its events and fetch the report."""
+    record = {'topic': topic, 'ok': False}
+    started = time.monotonic()
+    try:
+        response = requests.post(f"{base_url}/research",
+                                 json={'topic': topic, 'research_depth': depth}, timeout=30)
+        response.raise_for_status()
+        run = response.json()
+        record['submit_seconds'] = time.monotonic() - started
+
+        status = None
+        with requests.get(f"{base_url}/research/{run['run_id']}/events",
+                          stream=True, timeout=timeout) as stream:
+            event_type = None
+            for line in stream.iter_lines(decode_unicode=True):
+                if line.startswith("event:"):
+                    event_type = line.split(":", 1)[1].strip()
+                elif line.startswith("data:"):
+                    if 'first_event_seconds' not in record:
+                        record['first_event_seconds'] = time.monotonic() - started
+                    if event_type == "status":
+                        status = json.loads(line.split(":", 1)[1])
+                        break
+
+        record['status'] = status['status'] if status else 'unknown'
+        if record['status'] == 'completed':
+            report = requests.get(f"{base_url}/research/{run['run_id']}/report", timeout=60)
+            report.raise_for_status()
+            record['report_chars'] = len(report.text)
+            record['ok'] = True
+        else:
+            record['error'] = status.get('error') if status else 'stream ended without status'
+    except Exception as e:
+        record['error'] = str(e)
+
+    record['total_seconds'] = time.monotonic() - started
+    results.append(record)
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+def summarize(name, values):
+    if not values:
+        print(f"  {name:<22} n/a")
+        return
+    print(f"  {name:<22} p50={statistics.median(values):8.2f}s  "
+          f"p95={percentile(values, 0.95):8.2f}s  max={max(values):8.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the research API server")
+    parser.add_argument("--url", default="http://localhost:8000", help="API base URL")
+    parser.add_argument("--clients", type=int, default=5, help="Concurrent clients")
+    parser.add_argument("--depth", default="quick", choices=["quick", "standard", "deep"])
+    parser.add_argument("--topics-file", help="File with one topic per line")
+    parser.add_argument("--timeout", type=float, default=1800, help="Per-run timeout in seconds")
+    args = parser.parse_args()
+
+    topics = DEFAULT_TOPICS
+    if args.topics_file:
+        with open(args.topics_file, 'r', encoding='utf-8') as f:
+            topics = [line.strip() for line in f if line.strip()]
+
+    requests.get(f"{args.url}/health", timeout=10).raise_for_status()
+
+    results = []
+    threads = [
+        threading.Thread(target=run_client,
+                         args=(args.url, topics[i % len(topics)], args.depth, results, args.timeout))
+        for i in range(args.clients)
+    ]
+
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    succeeded = [r for r in results if r['ok']]
+    print(f"\n{len(succeeded)}/{len(results)} runs completed in {elapsed:.1f}s "
+          f"({len(results) / elapsed * 60:.1f} runs/min)")
+    summarize("submit latency", [r['submit_seconds'] for r in results if 'submit_seconds' in r])
+    summarize("time to first event", [r['first_event_seconds'] for r in results if 'first_event_seconds' in r])
+    summarize("run duration", [r['total_seconds'] for r in succeeded])
+
+    for record in results:
+        if not record['ok']:
+            print(f"  ✗ {record['topic'][:50]}: {record.get('error')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+# Runs package
+from .executor import run_research, SECTION_TITLES
+from .manager import RunManager, RunHandle, get_run_manager
+from .resources import get_shared_llm, warm_up
+from .scheduler import RunBudget, BudgetExhausted
+from .worker_pool import WorkerPool
+
+__all__ = [
+    'run_research',
+    'SECTION_TITLES',
+    'RunManager',
+    'RunHandle',
+    'get_run_manager',
+    'get_shared_llm',
+    'warm_up',
+    'RunBudget',
+    'BudgetExhausted',
+    'WorkerPool'
+]
@@ -0,0 +1,52 @@
+"""
+Run research from the command line.
+
+Usage:
+    python -m src.runs "Impact of AI on healthcare diagnostics" --depth quick
+    python -m src.runs "Renewable energy economics" --profile
+    python -m src.runs "Battery recycling" --deadline 300 --max-tokens 200000
+    python -m src.runs "Battery recycling" --resume <run_id of a failed run>
+"""
+
+import argparse
+import json
+import sys
+
+from .manager import RunManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the multi-agent research workflow")
+    parser.add_argument("topic", help="Research topic")
+    parser.add_argument("--depth", default="standard", choices=["quick", "standard", "deep"],
+                        help="Research depth")
+    parser.add_argument("--profile", action="store_true",
+                        help="Write a CPU, memory and wait profile next to the report")
+    parser.add_argument("--deadline", type=float, default=None,
+                        help="Deliver a report within this many seconds (default: RUN_DEADLINE_SECONDS)")
+    parser.add_argument("--max-tokens", type=int, default=None,
+                        help="LLM token budget of the run (default: RUN_TOKEN_BUDGET)")
+    parser.add_argument("--resume", metavar="RUN_ID", default=None,
+                        help="Continue a failed run of the same topic and depth")
+    args = parser.parse_args()
+
+    handle = RunManager(max_workers=1).submit(args.topic, args.depth, profile=args.profile,
+                                              deadline_seconds=args.deadline,
+                                              max_tokens=args.max_tokens, resume=args.resume)
+
+    # Print progress events as they arrive
+    seen = 0
+    while True:
+        events = handle.wait_for_events(seen, timeout=5)
+        for event in events:
+            print(event['message'])
+        seen += len(events)
+        if handle.done and seen >= len(handle.events):
+            break
+
+    print(json.dumps(handle.to_dict(), indent=2))
+    return 0 if handle.status == "completed" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""Map-reduce summarization of scraped pages into a source digest.
+
+The researcher reads raw page text, and its findings used to be all the
+analyzer and writer got. Between the research task and the analysis, every
+page collected in the run is now summarized on its own (map) with the
+provider's small, fast model, concurrently on ``SUMMARY_WORKERS`` threads.
+The summaries are then merged (reduce) into a compact, cited source digest
+of at most ``DIGEST_MAX_CHARS`` characters. The analyzer and writer receive
+this digest in place of the researcher's raw findings.
+
+Identical prompts are coalesced through the ``llm`` single-flight group, so
+concurrent runs that scraped the same page share one summary call.
+"""
+
+import contextvars
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from ..utils.cancellation import check_cancelled, charge_tokens
+from ..utils.profiling import blocking_span
+from ..utils.singleflight import coalesce
+
+MAP_PROMPT = """Summarize the following web page for a research report on "{topic}".
+
+Keep only information relevant to the topic: key facts, statistics with their
+numbers, dates, named organizations and people, claims and their evidence.
+Write at most {max_words} words as concise bullet points. Do not add
+information that is not in the page.
+
+Source: {url}
+
+Page content:
+{text}"""
+
+REDUCE_PROMPT = """Merge the following source summaries for a research report on "{topic}"
+into one digest of at most {max_words} words.
+
+Group related points by theme, drop repeated facts and keep numbers exact.
+Cite the source URL in brackets after every point, e.g. [https://example.com].
+
+Summaries:
+{summaries}"""
+
+# Rough characters per word for prompt budgets
+CHARS_PER_WORD = 6
+
+# Characters per token when the provider does not report usage
+CHARS_PER_TOKEN = 4
+
+# Merge rounds before the remaining parts are merged in a single call
+MAX_REDUCE_ROUNDS = 3
+
+
+def _usage(response, prompt, content):
+    """Prompt and completion tokens of a response, estimated if not reported."""
+    usage = getattr(response, 'usage_metadata', None) or {}
+    if usage.get('input_tokens') is not None:
+        return usage['input_tokens'], usage.get('output_tokens', 0)
+    return len(prompt) // CHARS_PER_TOKEN, len(content) // CHARS_PER_TOKEN
+
+
+def _invoke(llm, prompt):
+    """Call the LLM once per distinct prompt across concurrent callers."""
+    # Stop before the call, never inside the coalesced section other runs wait on
+    check_cancelled()
+    model = getattr(llm, 'model_name', None) or getattr(llm, 'model', '')
+    key = hashlib.sha1(f"{model}\n{prompt}".encode('utf-8')).hexdigest()
+
+    def call():
+        with blocking_span("llm_summary"):
+            response = llm.invoke(prompt)
+        content = getattr(response, 'content', str(response)).strip()
+        # Only the run making the call pays for it
+        charge_tokens(*_usage(response, prompt, content))
+        return content
+
+    return coalesce("llm", key, call)
+
+
+def _with_context(fn):
+    """Run ``fn`` in pool threads with the caller's context (e.g. the run's profiler)."""
+    context = contextvars.copy_context()
+    return lambda *args: context.copy().run(fn, *args)
+
+
+def summarize_pages(pages, topic, llm, workers=None, max_words=None):
+    """
+    Summarize each page independently and concurrently (map step).
+
+    Args:
+        pages (dict): Page text keyed by URL
+        topic (str): Research topic
+        llm: Chat model used for the summaries
+        workers (int): Concurrent summary calls (default: SUMMARY_WORKERS or 4)
+        max_words (int): Word budget per summary (default: SUMMARY_MAX_WORDS or 120)
+
+    Returns:
+        dict: Summary keyed by URL; pages whose summary failed are left out
+    """
+    if workers is None:
+        workers = int(os.getenv("SUMMARY_WORKERS", 4))
+    if max_words is None:
+        max_words = int(os.getenv("SUMMARY_MAX_WORDS", 120))
+
+    def summarize(item):
+        url, text = item
+        try:
+            return url, _invoke(llm, MAP_PROMPT.format(topic=topic, max_words=max_words, url=url, text=text))
+        except Exception as e:
+            print(f"⚠ Failed to summarize {url}: {str(e)}")
+            return url, None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="summary") as executor:
+        results = executor.map(_with_context(summarize), pages.items())
+        return {url: summary for url, summary in results if summary}
+
+
+def _format_summaries(summaries):
+    return "\n\n".join(f"Source: {url}\n{summary}" for url, summary in summaries.items())
+
+
+def reduce_summaries(summaries, topic, llm, max_chars=None, workers=None):
+    """
+    Merge page summaries into a digest that fits the budget (reduce step).
+
+    Summaries that already fit are joined as they are. Otherwise they are
+    merged in batches, concurrently, until the result fits.
+
+    Args:
+        summaries (dict): Summary keyed by URL
+        topic (str): Research topic
+        llm: Chat model used for merging
+        max_chars (int): Digest budget (default: DIGEST_MAX_CHARS or 6000)
+        workers (int): Concurrent merge calls (default: SUMMARY_WORKERS or 4)
+
+    Returns:
+        str: Source digest
+    """
+    if max_chars is None:
+        max_chars = int(os.getenv("DIGEST_MAX_CHARS", 6000))
+    if workers is None:
+        workers = int(os.getenv("SUMMARY_WORKERS", 4))
+
+    parts = [_format_summaries({url: summary}) for url, summary in summaries.items()]
+    max_words = max_chars // CHARS_PER_WORD
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="summary") as executor:
+        for _ in range(MAX_REDUCE_ROUNDS):
+            if len("\n\n".join(parts)) <= max_chars or len(parts) == 1:
+                break
+            # Batches sized so each merge prompt stays around twice the budget
+            batches, batch = [], []
+            for part in parts:
+                if batch and len("\n\n".join(batch + [part])) > 2 * max_chars:
+                    batches.append(batch)
+                    batch = []
+                batch.append(part)
+            batches.append(batch)
+            if len(batches) == len(parts):
+                # Every summary is too large to pair up; merge them in twos
+                batches = [parts[i:i + 2] for i in range(0, len(parts), 2)]
+
+            merged = executor.map(
+                _with_context(lambda batch: _invoke(llm, REDUCE_PROMPT.format(
+                    topic=topic, max_words=max_words, summaries="\n\n".join(batch)))),
+                batches
+            )
+            parts = list(merged)
+
+        digest = "\n\n".join(parts)
+
+    if len(digest) > max_chars:
+        digest = _invoke(llm, REDUCE_PROMPT.format(topic=topic, max_words=max_words, summaries=digest))
+    return digest
+
+
+def build_source_digest(pages, topic, llm):
+    """
+    Summarize the pages collected in a run into a compact source digest.
+
+    Args:
+        pages (dict): Page text keyed by URL
+        topic (str): Research topic
+        llm: Small, fast chat model
+
+    Returns:
+        str: Source digest, or an empty string if there was nothing to summarize
+    """
+    if not pages:
+        return ""
+    summaries = summarize_pages(pages, topic, llm)
+    if not summaries:
+        return ""
+    return reduce_summaries(summaries, topic, llm)
@@ -0,0 +1,259 @@
+"""Research run execution, independent of the user interface."""
+
+import math
+import os
+import time
+
+from crewai import Crew, Process
+
+from ..agents import (
+    create_researcher_agent,
+    create_analyzer_agent,
+    create_writer_agent,
+    create_critic_agent
+)
+from ..tasks import create_research_tasks, TASK_AGENTS
+from ..tools import use_deduplicator, use_prefetcher, use_novelty_tracker
+from ..utils import load_config, CheckpointStore, make_run_id, build_crew_memory
+from .resources import get_shared_llm, get_run_configs
+from .digest import build_source_digest
+from .scheduler import RunBudget, RunScheduler, BudgetExhausted, on_agent_step, track_crew
+
+# Checkpoint key of the source digest built between research and analysis
+DIGEST_KEY = 'digest'
+
+# Section titles for each task output written to the report
+SECTION_TITLES = {
+    'research': "Research Findings",
+    DIGEST_KEY: "Source Digest",
+    'analyze': "Analysis",
+    'write': "Research Report",
+    'review': "Quality Review"
+}
+
+# Section title of the report compiled when a run's budget runs out
+PARTIAL_REPORT_TITLE = "Partial Report"
+
+# Task outputs used for a partial report, best first
+PARTIAL_REPORT_SOURCES = ['write', 'analyze', 'research']
+
+
+def _no_progress(message, **data):
+    pass
+
+
+def _partial_report(completed, pages):
+    """Report compiled from the steps a run finished before its budget ran out."""
+    note = ("*This run reached its time or token budget before every step finished. "
+            "The report below was compiled from the steps that did complete.*")
+    for task_key in PARTIAL_REPORT_SOURCES:
+        if completed.get(task_key):
+            return f"{note}\n\n{completed[task_key]}"
+    sources = "\n".join(f"- {url}" for url in pages) or "- No sources were collected."
+    return f"{note}\n\nNo research step finished in time. Sources collected so far:\n\n{sources}"
+
+
+def run_research(topic, research_depth, sink=None, run_id=None, progress=None, metrics=None,
+                 budget=None):
+    """
+    Execute the multi-agent research workflow.
+
+    Every completed task is checkpointed, so a run that fails part-way
+    (rate limits, timeouts, a dropped session) resumes from the last
+    completed task the next time it is started with the same run id.
+
+    After the research task, the pages it collected are summarized
+    concurrently with a fast model and merged into a source digest that the
+    analyzer and writer receive with the findings (``SOURCE_DIGEST``).
+
+    With a deadline or token budget, each step runs as its own crew and the
+    run degrades to stay within budget: fewer scrapes, no digest, a shorter
+    report and no critic review, in that order. If the budget runs out
+    mid-step, a partial report is compiled from the completed steps. The
+    degradations applied are listed in ``metrics['degradations']``.
+
+    Args:
+        topic (str): Research topic
+        research_depth (str): Depth of research (quick, standard, deep)
+        sink (ReportSink): Optional sink that receives each task output
+            as soon as the task completes
+        run_id (str): Checkpoint key; the id of an earlier run resumes it
+            (default: a new run)
+        progress (callable): Optional hook called as ``progress(message, **data)``
+            with status updates; task completions pass ``task=<task key>``
+        metrics (dict): Optional dict filled with run metrics (e.g. prefetch stats)
+        budget (RunBudget): Deadline and token budget of the run
+            (default: RUN_DEADLINE_SECONDS and RUN_TOKEN_BUDGET, unlimited if unset)
+
+    Returns:
+        str: Final research report
+
+    Raises:
+        Exception: Any error raised while building or running the crew
+    """
+    if progress is None:
+        progress = _no_progress
+    if metrics is None:
+        metrics = {}
+    if budget is None:
+        budget = RunBudget()
+    scheduler = RunScheduler(budget, metrics)
+
+    # Load configuration
+    config = load_config()
+    agent_config, task_config, memory_config = get_run_configs()
+
+    # Restore outputs of tasks completed in an earlier attempt
+    if run_id is None:
+        run_id = make_run_id(topic, research_depth)
+    checkpoint = CheckpointStore(run_id)
+    completed = checkpoint.load()
+
+    for task_key, output in completed.items():
+        if sink is not None:
+            sink.write_section(SECTION_TITLES.get(task_key, task_key), output)
+        if task_key in TASK_AGENTS:
+            progress(f"♻️ Restored {task_key} from checkpoint", task=task_key)
+    digest = completed.pop(DIGEST_KEY, None)
+
+    if len(completed) == len(TASK_AGENTS):
+        checkpoint.clear()
+        return completed[list(TASK_AGENTS)[-1]]
+
+    # Reuse the process-wide LLM client (created on first use)
+    progress("🔧 Initializing AI model...")
+    llm = get_shared_llm(config, temperature=0.5)
+
+    # Create agents with single LLM instance
+    progress("🔧 Creating specialized agents...")
+    agents = {
+        'researcher': create_researcher_agent(agent_config, llm),
+        'analyzer': create_analyzer_agent(agent_config, llm),
+        'writer': create_writer_agent(agent_config, llm),
+        'critic': create_critic_agent(agent_config, llm)
+    }
+
+    # Create tasks
+    progress("📋 Creating research tasks...")
+
+    def task_callback(task_key, output):
+        if scheduler.cancelled:
+            # A step abandoned at the deadline finished after the partial report
+            return
+        checkpoint.save(task_key, output, topic=topic, research_depth=research_depth)
+        if sink is not None:
+            sink.write_section(SECTION_TITLES.get(task_key, task_key), output)
+        progress(f"✅ {TASK_AGENTS[task_key].capitalize()} completed", task=task_key)
+
+    use_digest = os.getenv("SOURCE_DIGEST", "true").lower() == "true"
+    crew_memory = build_crew_memory(memory_config)
+
+    def kickoff(task_keys=None, context=None, notes=None):
+        tasks = create_research_tasks(agents, task_config, topic, task_callback=task_callback,
+                                      completed=context or completed, task_keys=task_keys,
+                                      notes=notes)
+        # crewai gives up on an agent shortly after the run's deadline too
+        seconds = budget.remaining_seconds()
+        for agent in agents.values():
+            agent.max_execution_time = math.ceil(max(seconds, 0)) + 1 if seconds is not None else None
+        crew = Crew(
+            agents=list(agents.values()),
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True,
+            step_callback=on_agent_step,
+            **crew_memory
+        )
+        return track_crew(crew).kickoff()
+
+    # Execute research
+    progress("🚀 Assembling research crew...")
+    progress("🔍 Research in progress... This may take a few minutes.")
+
+    # Run the crew; duplicate pages are only collected once per run, top
+    # search hits are prefetched while the agent is thinking and research
+    # stops once new pages no longer add information
+    with use_deduplicator() as deduplicator, use_prefetcher() as prefetcher, \
+            use_novelty_tracker() as novelty:
+        try:
+            if not use_digest and not budget.limited:
+                result = str(kickoff())
+            else:
+                # Research runs on its own so its pages can be summarized
+                # before the analyzer starts, and so that a budgeted run can
+                # re-plan between steps
+                if 'research' not in completed:
+                    if budget.limited:
+                        scheduler.limit_research(novelty)
+                    completed['research'] = str(scheduler.run(
+                        'research', lambda: kickoff(task_keys=['research'])))
+                    scheduler.record_research(novelty)
+
+                if (use_digest and digest is None and deduplicator.pages
+                        and not scheduler.skip_digest()):
+                    progress(f"📚 Summarizing {len(deduplicator.pages)} sources...")
+                    started = time.monotonic()
+                    try:
+                        fast_llm = get_shared_llm(config, temperature=0.2, fast=True)
+                        digest = scheduler.run('digest', lambda: build_source_digest(
+                            deduplicator.pages, topic, fast_llm))
+                    except BudgetExhausted:
+                        raise
+                    except Exception as e:
+                        # The digest only condenses context; the findings are enough to go on
+                        print(f"⚠ Source digest failed: {str(e)}")
+                        digest = ""
+                    metrics['digest'] = {
+                        'pages': len(deduplicator.pages),
+                        'page_chars': sum(len(text) for text in deduplicator.pages.values()),
+                        'digest_chars': len(digest),
+                        'seconds': round(time.monotonic() - started, 1)
+                    }
+                    if digest:
+                        checkpoint.save(DIGEST_KEY, digest, topic=topic, research_depth=research_depth)
+                        if sink is not None:
+                            sink.write_section(SECTION_TITLES[DIGEST_KEY], digest)
+
+                # The digest replaces the raw findings downstream, so the
+                # analyzer and writer prompts shrink instead of growing
+                context = dict(completed)
+                if digest:
+                    context['research'] = (
+                        "Source digest (summaries of every page collected, with their URLs):\n"
+                        + digest
+                    )
+
+                if not budget.limited:
+                    result = str(kickoff(context=context))
+                else:
+                    # One crew per step, checking the budget in between
+                    for task_key in list(TASK_AGENTS)[1:]:
+                        if task_key in completed:
+                            continue
+                        if task_key == 'review' and scheduler.skip_review():
+                            break
+                        notes = {task_key: scheduler.writer_note()} if task_key == 'write' else None
+                        output = scheduler.run(task_key, lambda task_key=task_key, notes=notes: kickoff(
+                            task_keys=[task_key], context=context, notes=notes))
+                        completed[task_key] = context[task_key] = str(output)
+                    result = completed.get('review') or completed['write']
+        except BudgetExhausted as e:
+            # Stop the abandoned step from fetching more and deliver what is done
+            novelty.stop('deadline')
+            progress(f"⏱️ Run budget exhausted ({str(e)}), compiling a partial report...")
+            result = _partial_report(completed, deduplicator.pages)
+            if sink is not None:
+                sink.write_section(PARTIAL_REPORT_TITLE, result)
+            # Keep the checkpoint: submitting the run again resumes it
+            return result
+        finally:
+            metrics['prefetch'] = prefetcher.stats()
+            metrics['duplicates_skipped'] = deduplicator.skipped_urls + deduplicator.skipped_pages
+            metrics['novelty'] = novelty.stats()
+            if budget.limited:
+                metrics['budget'] = budget.to_dict()
+
+    # The run finished, so there is nothing left to resume
+    checkpoint.clear()
+
+    return result
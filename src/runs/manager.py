@@ -0,0 +1,325 @@
+"""Background execution of research runs.
+
+Runs are executed on a bounded thread pool that lives for the whole server
+process instead of inside a Streamlit script run. Callers get a
+:class:`RunHandle` they can poll for status, events and the report path, and
+can look the handle up again by run id after a browser refresh.
+"""
+
+import asyncio
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from ..utils import (
+    ReportSink, CheckpointStore, get_report_archive, make_run_id, is_valid_run_id, profile_run,
+    purge_expired_checkpoints
+)
+from .executor import run_research
+from .scheduler import RunBudget
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# Finished handles kept around for reattaching clients
+MAX_FINISHED_RUNS = 200
+
+# Seconds a worker waits for a step abandoned at the deadline to stop; it
+# stops at its next tool or LLM call, so this covers one call or scrape
+ABANDONED_STEP_TIMEOUT = 120
+
+
+class RunHandle:
+    """Status, progress events and outcome of a single research run."""
+
+    def __init__(self, run_id, topic, research_depth, profile=False, deadline_seconds=None,
+                 max_tokens=None, submitted_at=None):
+        self.run_id = run_id
+        self.topic = topic
+        self.research_depth = research_depth
+        self.profile = profile
+        self.deadline_seconds = deadline_seconds
+        self.max_tokens = max_tokens
+        # The deadline counts from submission, so time spent queued is included
+        self.submitted_at = submitted_at if submitted_at is not None else time.time()
+        self.status = QUEUED
+        self.created_at = datetime.fromtimestamp(self.submitted_at).isoformat(timespec='seconds')
+        self.started_at = None
+        self.finished_at = None
+        self.report_path = None
+        self.error = None
+        self.completed_tasks = []
+        self.metrics = {}
+        self.events = []
+        self._condition = threading.Condition()
+        self._listeners = []
+
+    @property
+    def done(self):
+        return self.status in (COMPLETED, FAILED)
+
+    def add_event(self, message, **data):
+        """Record a progress event and wake up anyone waiting for events."""
+        with self._condition:
+            event = {'time': datetime.now().isoformat(timespec='seconds'), 'message': message}
+            event.update(data)
+            self.events.append(event)
+            if data.get('task') and data['task'] not in self.completed_tasks:
+                self.completed_tasks.append(data['task'])
+            self._notify()
+
+    def _set_status(self, status, **fields):
+        with self._condition:
+            self.status = status
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self._notify()
+
+    def _notify(self):
+        # Called with the condition held
+        self._condition.notify_all()
+        for wake in self._listeners:
+            wake()
+
+    def wait_for_events(self, since, timeout=None):
+        """
+        Block until there are events after position ``since`` or the run ends.
+
+        Args:
+            since (int): Number of events already seen
+            timeout (float): Maximum seconds to wait
+
+        Returns:
+            list: New events (possibly empty on timeout)
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: len(self.events) > since or self.done, timeout)
+            return list(self.events[since:])
+
+    async def wait_for_events_async(self, since, timeout=None):
+        """
+        Coroutine version of :meth:`wait_for_events` that waits on the event
+        loop instead of blocking a thread.
+
+        Args:
+            since (int): Number of events already seen
+            timeout (float): Maximum seconds to wait
+
+        Returns:
+            list: New events (possibly empty on timeout)
+        """
+        loop = asyncio.get_running_loop()
+        arrived = asyncio.Event()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(arrived.set)
+            except RuntimeError:
+                # The event loop has been closed
+                pass
+
+        with self._condition:
+            if len(self.events) > since or self.done:
+                return list(self.events[since:])
+            self._listeners.append(wake)
+        try:
+            await asyncio.wait_for(arrived.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._condition:
+                self._listeners.remove(wake)
+        with self._condition:
+            return list(self.events[since:])
+
+    def wait(self, timeout=None):
+        """Block until the run has finished. Returns True if it did."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.done, timeout)
+
+    def to_dict(self):
+        """Serializable snapshot of the run."""
+        with self._condition:
+            return {
+                'run_id': self.run_id,
+                'topic': self.topic,
+                'research_depth': self.research_depth,
+                'profile': self.profile,
+                'deadline_seconds': self.deadline_seconds,
+                'max_tokens': self.max_tokens,
+                'status': self.status,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'completed_tasks': list(self.completed_tasks),
+                'metrics': dict(self.metrics),
+                'report_path': self.report_path,
+                'error': self.error
+            }
+
+
+def execute_run(handle):
+    """
+    Run research for a handle, recording status, events, metrics and the report.
+
+    Args:
+        handle (RunHandle): Run to execute; errors are recorded on it, not raised
+    """
+    handle._set_status(RUNNING, started_at=datetime.now().isoformat(timespec='seconds'))
+    started = time.monotonic()
+    budget = RunBudget(handle.deadline_seconds, handle.max_tokens, started_at=handle.submitted_at)
+    try:
+        with ReportSink(handle.topic) as sink:
+            # Profiles are written next to the report
+            with profile_run(sink.path.stem, sink.path.parent,
+                             enabled=handle.profile or None) as profiler:
+                result = run_research(handle.topic, handle.research_depth, sink=sink,
+                                      run_id=handle.run_id, progress=handle.add_event,
+                                      metrics=handle.metrics, budget=budget)
+            if result and sink.section_count == 0:
+                sink.write_section("Research Report", result)
+
+        if profiler is not None and profiler.paths:
+            handle.metrics['profile'] = profiler.paths
+
+        handle.metrics['duration_seconds'] = round(time.monotonic() - started, 1)
+        handle.metrics['research_depth'] = handle.research_depth
+        get_report_archive().add_stored_report(sink.path, metrics=handle.metrics)
+        handle.add_event("✅ Research completed successfully!")
+        handle._set_status(COMPLETED, report_path=str(sink.path),
+                           finished_at=datetime.now().isoformat(timespec='seconds'))
+    except Exception as e:
+        traceback.print_exc()
+        handle.add_event(f"❌ Error during research: {str(e)}")
+        handle._set_status(FAILED, error=str(e),
+                           finished_at=datetime.now().isoformat(timespec='seconds'))
+    finally:
+        # The report is already delivered; don't let an abandoned step
+        # overlap the next run on this worker
+        if not budget.wait_abandoned(ABANDONED_STEP_TIMEOUT):
+            print(f"⚠️ A step of run {handle.run_id} was still running {ABANDONED_STEP_TIMEOUT}s after its deadline")
+
+
+class RunManager:
+    """Runs research in a background pool and tracks handles by run id."""
+
+    def __init__(self, max_workers=None):
+        """
+        Args:
+            max_workers (int): Concurrent runs (default: RESEARCH_WORKERS or 4)
+        """
+        if max_workers is None:
+            max_workers = int(os.getenv("RESEARCH_WORKERS", 4))
+        self.max_workers = max_workers
+        self._runs = {}
+        self._lock = threading.Lock()
+        purge_expired_checkpoints()
+        self._start_pool()
+
+    def _start_pool(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="research")
+
+    def submit(self, topic, research_depth, profile=False, deadline_seconds=None, max_tokens=None,
+               owner=None, resume=None):
+        """
+        Start a research run in the background.
+
+        The same owner submitting a topic that is already queued or running
+        gets the existing handle instead of a duplicate run, and a topic
+        whose earlier run failed resumes from its checkpoint.
+
+        Args:
+            topic (str): Research topic
+            research_depth (str): Depth of research (quick, standard, deep)
+            profile (bool): Capture a CPU, memory and wait profile next to
+                the report (always on when RESEARCH_PROFILE is set)
+            deadline_seconds (float): Seconds from submission within which a
+                report is delivered (default: RUN_DEADLINE_SECONDS)
+            max_tokens (int): LLM token budget of the run (default: RUN_TOKEN_BUDGET)
+            owner (str): Submitter identity, e.g. a browser session or API
+                client (default: none, every submission is a new run)
+            resume (str): Run id of an earlier run of the same topic and
+                depth to continue
+
+        Returns:
+            RunHandle: Handle to poll for progress and results
+
+        Raises:
+            ValueError: If ``resume`` is not a run id
+        """
+        if resume is not None and not is_valid_run_id(resume):
+            raise ValueError(f"Invalid run id: {resume!r}")
+        if resume and CheckpointStore(resume).matches(topic, research_depth):
+            run_id = resume
+        else:
+            run_id = make_run_id(topic, research_depth, owner)
+        with self._lock:
+            handle = self._runs.get(run_id)
+            if handle is not None and not handle.done:
+                return handle
+
+            handle = RunHandle(run_id, topic, research_depth, profile=profile,
+                               deadline_seconds=deadline_seconds, max_tokens=max_tokens)
+            self._runs.pop(run_id, None)
+            self._runs[run_id] = handle
+            self._prune()
+
+        self._start(handle)
+        return handle
+
+    def get(self, run_id):
+        """Return the handle of a run, or None if it is unknown."""
+        with self._lock:
+            return self._runs.get(run_id)
+
+    def list_runs(self):
+        """Snapshots of all tracked runs, oldest first."""
+        with self._lock:
+            handles = list(self._runs.values())
+        return [handle.to_dict() for handle in handles]
+
+    def stats(self):
+        """Pool size and run counts by status."""
+        with self._lock:
+            statuses = [handle.status for handle in self._runs.values()]
+        return {
+            'pool': 'thread',
+            'workers': self.max_workers,
+            'runs': {status: statuses.count(status) for status in (QUEUED, RUNNING, COMPLETED, FAILED)}
+        }
+
+    def _prune(self):
+        finished = [run_id for run_id, handle in self._runs.items() if handle.done]
+        for run_id in finished[:max(0, len(finished) - MAX_FINISHED_RUNS)]:
+            del self._runs[run_id]
+
+    def _start(self, handle):
+        self._executor.submit(execute_run, handle)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_run_manager():
+    """
+    Return the process-wide run manager.
+
+    Runs execute on threads of this process by default. With
+    ``RESEARCH_POOL=process`` they go to a pool of pre-warmed worker
+    processes instead (see ``worker_pool``).
+    """
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            if os.getenv("RESEARCH_POOL", "thread").lower() == "process":
+                from .worker_pool import WorkerPool
+                _manager = WorkerPool()
+            else:
+                _manager = RunManager()
+        return _manager
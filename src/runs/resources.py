@@ -0,0 +1,79 @@
+"""Shared, pre-warmed resources reused across research runs.
+
+Building an LLM client, parsing ``agents_config.yaml`` and importing the tool
+stack are repeated for every run otherwise. Long-lived servers (the API
+server, worker processes) call :func:`warm_up` once at startup; runs then
+reuse the same clients and their HTTP connection pools.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+from ..utils import load_config, get_agent_config, get_task_config, get_memory_config
+from ..utils.llm_factory import create_llm
+
+_lock = threading.Lock()
+_llms = {}
+_configs = {}
+
+# Get the project root directory
+CONFIG_PATH = Path(__file__).parent.parent.parent / "config" / "agents_config.yaml"
+
+
+def get_shared_llm(config, temperature=0.5, fast=False):
+    """
+    Return an LLM client shared by all runs in this process.
+
+    Args:
+        config: Configuration object with API keys
+        temperature (float): Model temperature
+        fast (bool): Use the provider's small, fast model
+
+    Returns:
+        LLM instance
+    """
+    key = (config.primary_provider, temperature, fast)
+    with _lock:
+        if key not in _llms:
+            _llms[key] = create_llm(config, temperature=temperature, fast=fast)
+        return _llms[key]
+
+
+def get_run_configs():
+    """
+    Return the parsed agent, task and memory configuration.
+
+    The YAML file is only parsed again when it changes on disk.
+
+    Returns:
+        tuple: (agent_config, task_config, memory_config)
+    """
+    mtime = os.path.getmtime(CONFIG_PATH)
+    with _lock:
+        if _configs.get('mtime') != mtime:
+            _configs['mtime'] = mtime
+            _configs['values'] = (get_agent_config(), get_task_config(), get_memory_config())
+        return _configs['values']
+
+
+def warm_up(temperature=0.5):
+    """
+    Preload configuration, the LLM client and the tool stack.
+
+    Args:
+        temperature (float): Temperature of the LLM client to create
+
+    Returns:
+        float: Seconds spent warming up
+    """
+    started = time.monotonic()
+    config = load_config()
+    get_run_configs()
+    get_shared_llm(config, temperature)
+
+    # Importing the tools loads the search and scraping dependencies
+    from .. import tools  # noqa: F401
+
+    return time.monotonic() - started
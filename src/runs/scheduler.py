@@ -0,0 +1,435 @@
+"""Deadline- and budget-aware scheduling of a research run.
+
+A run can be given a deadline (seconds from submission) and a token budget.
+The executor runs each step as its own crew. Before each step the scheduler
+compares the budget left with the share planned for the remaining steps
+(``STEP_SHARES``) and degrades, in order of least quality lost:
+
+- the research phase gets a time and page allowance; once it is used up
+  the search and scraping tools stop fetching (fewer scrapes)
+- the source digest is skipped when the run is well behind plan
+- the writer is asked for a shorter report when the run is behind plan
+- the critic's review is skipped when the run is behind plan
+
+If the deadline passes during a step, the step is abandoned and the report is
+compiled from the steps completed so far, so a result is always delivered
+within the deadline. The run is then cancelled: the abandoned step stops at
+its next tool or LLM call (see ``src.utils.cancellation``), and the agents'
+``max_execution_time`` bounds it as well. Tokens are charged after every
+agent step and LLM call, prompt included, so a step that spends the token
+budget is stopped part-way the same way. Every degradation is recorded in
+the run metrics.
+
+Defaults come from ``RUN_DEADLINE_SECONDS`` and ``RUN_TOKEN_BUDGET`` (unset or
+0 means no limit).
+"""
+
+import contextvars
+import os
+import threading
+import time
+
+from ..utils.cancellation import StepCancelled, current_step, use_step
+
+# Planned share of the budget for each step of a run
+STEP_SHARES = {
+    'research': 0.45,
+    'digest': 0.10,
+    'analyze': 0.15,
+    'write': 0.20,
+    'review': 0.10
+}
+
+# Rough tokens consumed per scraped page (page text plus the agent's reasoning)
+TOKENS_PER_PAGE = 2500
+
+# Pages the researcher may always scrape, however short the budget
+MIN_PAGES = 2
+
+# Report length asked of the writer, and the floor when shortening it
+DEFAULT_REPORT_WORDS = 2500
+MIN_REPORT_WORDS = 600
+
+# Below this budget ratio the digest is skipped
+DIGEST_MIN_RATIO = 0.6
+
+# Characters per token when a crew does not report its usage
+CHARS_PER_TOKEN = 4
+
+
+class BudgetExhausted(Exception):
+    """Raised when a run's deadline passes or its token budget is spent."""
+
+
+def _env_number(name):
+    value = float(os.getenv(name, 0) or 0)
+    return value if value > 0 else None
+
+
+class RunBudget:
+    """Deadline and token budget of a single run."""
+
+    def __init__(self, deadline_seconds=None, max_tokens=None, started_at=None):
+        """
+        Args:
+            deadline_seconds (float): Seconds the run may take, counted from
+                ``started_at`` (default: RUN_DEADLINE_SECONDS, None for no limit)
+            max_tokens (int): LLM tokens the run may use
+                (default: RUN_TOKEN_BUDGET, None for no limit)
+            started_at (float): ``time.time()`` the deadline counts from,
+                e.g. the submission time (default: now)
+        """
+        if deadline_seconds is None:
+            deadline_seconds = _env_number("RUN_DEADLINE_SECONDS")
+        if max_tokens is None:
+            max_tokens = _env_number("RUN_TOKEN_BUDGET")
+        self.deadline_seconds = deadline_seconds or None
+        self.max_tokens = int(max_tokens) if max_tokens else None
+        self.started_at = started_at if started_at is not None else time.time()
+        self.tokens_used = 0
+        # Set once the run stops on its budget; running steps then stop too
+        self.cancelled = threading.Event()
+        self._abandoned = []
+
+    @property
+    def limited(self):
+        return self.deadline_seconds is not None or self.max_tokens is not None
+
+    def elapsed_seconds(self):
+        return time.time() - self.started_at
+
+    def remaining_seconds(self):
+        """Seconds left before the deadline, or None without a deadline."""
+        if self.deadline_seconds is None:
+            return None
+        return self.deadline_seconds - self.elapsed_seconds()
+
+    def remaining_tokens(self):
+        """Tokens left in the budget, or None without a token budget."""
+        if self.max_tokens is None:
+            return None
+        return self.max_tokens - self.tokens_used
+
+    def exhausted(self):
+        if self.cancelled.is_set():
+            return True
+        remaining = [self.remaining_seconds(), self.remaining_tokens()]
+        return any(value is not None and value <= 0 for value in remaining)
+
+    def cancel(self):
+        """Stop the run: running steps stop at their next tool or LLM call."""
+        self.cancelled.set()
+
+    def abandon(self, thread):
+        """Keep track of a step thread the run stopped waiting for."""
+        self._abandoned.append(thread)
+
+    def wait_abandoned(self, timeout=None):
+        """
+        Wait for steps abandoned at the deadline to stop.
+
+        Args:
+            timeout (float): Maximum seconds to wait in total
+
+        Returns:
+            bool: True if every abandoned step has stopped
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for thread in self._abandoned:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in self._abandoned)
+
+    def to_dict(self):
+        return {
+            'deadline_seconds': self.deadline_seconds,
+            'max_tokens': self.max_tokens,
+            'elapsed_seconds': round(self.elapsed_seconds(), 1),
+            'tokens_used': self.tokens_used
+        }
+
+
+def _crew_tokens(crew):
+    """Tokens crewai reports for a crew's agents so far, or None."""
+    calculate = getattr(crew, 'calculate_usage_metrics', None)
+    if calculate is None:
+        return None
+    total = getattr(calculate(), 'total_tokens', None)
+    return int(total) if total is not None else None
+
+
+class StepGuard:
+    """
+    Cancellation and token accounting of a single step.
+
+    LLM calls made outside crewai charge their tokens directly
+    (``charge_tokens``); crews are charged after every agent step from the
+    usage crewai reports, or from an estimate of the conversation sent and
+    received when it reports none.
+    """
+
+    def __init__(self, step, budget):
+        """
+        Args:
+            step (str): Step name
+            budget (RunBudget): Budget of the run
+        """
+        self.step = step
+        self.budget = budget
+        self.reason = None
+        self._base_tokens = budget.tokens_used
+        self._lock = threading.Lock()
+        self._charged = 0
+        self._crew = None
+        self._crew_start = 0
+        self._estimated = 0
+        self._transcript_chars = 0
+
+    @property
+    def tokens(self):
+        """Tokens charged to the step so far."""
+        crew_tokens = 0
+        if self._crew is not None:
+            reported = _crew_tokens(self._crew)
+            if reported is not None:
+                crew_tokens = reported - self._crew_start
+        return self._charged + max(crew_tokens, self._estimated)
+
+    def _update(self):
+        self.budget.tokens_used = self._base_tokens + self.tokens
+
+    def check(self):
+        """
+        Stop the step if the run was cancelled or its budget is spent.
+
+        Raises:
+            StepCancelled: If the step must stop
+        """
+        if not self.budget.cancelled.is_set():
+            remaining_seconds = self.budget.remaining_seconds()
+            remaining_tokens = self.budget.remaining_tokens()
+            if remaining_tokens is not None and remaining_tokens <= 0:
+                self.reason = 'token_budget'
+            elif remaining_seconds is not None and remaining_seconds <= 0:
+                self.reason = 'deadline'
+            else:
+                return
+            self.budget.cancel()
+        raise StepCancelled(f"run stopped during {self.step}")
+
+    def charge(self, tokens):
+        """Charge the tokens of one LLM call (prompt and completion)."""
+        with self._lock:
+            self._charged += tokens
+            self._update()
+
+    def attach(self, crew):
+        """Account for the tokens of the crew running this step."""
+        with self._lock:
+            self._crew = crew
+            self._crew_start = _crew_tokens(crew) or 0
+            # The task descriptions carry the context of earlier steps
+            self._transcript_chars = sum(
+                len(str(task.description)) + len(str(getattr(task, 'expected_output', '') or ''))
+                for task in crew.tasks
+            )
+
+    def on_agent_step(self, step_output):
+        """Charge an agent step (one LLM call plus its tool result), then check the budget."""
+        text = str(getattr(step_output, 'text', '') or '')
+        result = str(getattr(step_output, 'result', '') or '')
+        with self._lock:
+            # Every call sends the conversation so far and adds its answer
+            self._estimated += (self._transcript_chars + len(text)) // CHARS_PER_TOKEN
+            self._transcript_chars += len(text) + len(result)
+            self._update()
+        self.check()
+
+    def finish(self, output):
+        """Charge the step's final usage once it has returned."""
+        with self._lock:
+            if self._crew is None and not self._charged:
+                # Neither a crew nor a charged LLM call: count the output at least
+                self._charged = len(str(output)) // CHARS_PER_TOKEN
+            elif self._crew is not None:
+                # The final answer, in case crewai skipped the step callback
+                self._estimated = max(self._estimated,
+                                      (self._transcript_chars + len(str(output))) // CHARS_PER_TOKEN)
+            self._update()
+
+
+def track_crew(crew):
+    """
+    Charge a crew's token usage to the step running in this context.
+
+    Args:
+        crew: crewai Crew about to be kicked off
+
+    Returns:
+        The same crew
+    """
+    guard = current_step()
+    if isinstance(guard, StepGuard):
+        guard.attach(crew)
+    return crew
+
+
+def on_agent_step(step_output):
+    """
+    crewai step callback: charge the step's tokens and stop it once the run
+    is cancelled or its budget is spent.
+    """
+    guard = current_step()
+    if isinstance(guard, StepGuard):
+        guard.on_agent_step(step_output)
+
+
+class RunScheduler:
+    """Tracks a run's budget across steps and decides on degradations."""
+
+    def __init__(self, budget, metrics):
+        """
+        Args:
+            budget (RunBudget): Budget of the run
+            metrics (dict): Run metrics; degradations are appended to
+                ``metrics['degradations']``
+        """
+        self.budget = budget
+        self.metrics = metrics
+        metrics.setdefault('degradations', [])
+
+    @property
+    def cancelled(self):
+        return self.budget.cancelled.is_set()
+
+    def degrade(self, name, step, **detail):
+        """Record a degradation in the run metrics."""
+        entry = {'name': name, 'step': step}
+        entry.update(detail)
+        self.metrics['degradations'].append(entry)
+        print(f"⏱️ Degraded run: {name} ({step})")
+
+    def ratio(self, step):
+        """
+        Budget left relative to the budget planned for this and later steps.
+
+        Returns:
+            float: Below 1 the run is behind plan; None without a budget
+        """
+        steps = list(STEP_SHARES)
+        planned_share = sum(STEP_SHARES[key] for key in steps[steps.index(step):])
+        ratios = []
+        if self.budget.deadline_seconds is not None:
+            ratios.append(self.budget.remaining_seconds() / (self.budget.deadline_seconds * planned_share))
+        if self.budget.max_tokens is not None:
+            ratios.append(self.budget.remaining_tokens() / (self.budget.max_tokens * planned_share))
+        return max(0.0, min(ratios)) if ratios else None
+
+    def _allowance(self, step):
+        """Time and tokens this step may use, given what is left for all remaining steps."""
+        steps = list(STEP_SHARES)
+        share = STEP_SHARES[step] / sum(STEP_SHARES[key] for key in steps[steps.index(step):])
+        remaining_seconds = self.budget.remaining_seconds()
+        remaining_tokens = self.budget.remaining_tokens()
+        return (
+            remaining_seconds * share if remaining_seconds is not None else None,
+            remaining_tokens * share if remaining_tokens is not None else None
+        )
+
+    def limit_research(self, tracker):
+        """Give the research phase its time and page allowance."""
+        seconds, tokens = self._allowance('research')
+        max_pages = None
+        if tokens is not None:
+            max_pages = max(MIN_PAGES, int(tokens // TOKENS_PER_PAGE))
+        if seconds is not None or max_pages is not None:
+            tracker.limit(seconds=seconds, max_pages=max_pages)
+
+    def record_research(self, tracker):
+        """Record a research phase cut short by its allowance."""
+        if tracker.stop_reason in ('time_budget', 'page_budget'):
+            self.degrade('fewer_scrapes', 'research', reason=tracker.stop_reason,
+                         pages=len(tracker.gains))
+
+    def skip_digest(self):
+        ratio = self.ratio('digest')
+        if ratio is not None and ratio < DIGEST_MIN_RATIO:
+            self.degrade('skipped_digest', 'digest', budget_ratio=round(ratio, 2))
+            return True
+        return False
+
+    def writer_note(self):
+        """Extra instruction for the writer when the run is behind plan, or None."""
+        ratio = self.ratio('write')
+        if ratio is None or ratio >= 1:
+            return None
+        words = max(MIN_REPORT_WORDS, int(DEFAULT_REPORT_WORDS * ratio) // 100 * 100)
+        self.degrade('shorter_report', 'write', words=words, budget_ratio=round(ratio, 2))
+        return (f"Time is limited: keep the report to about {words} words, "
+                f"covering the most important findings first.")
+
+    def skip_review(self):
+        ratio = self.ratio('review')
+        if ratio is not None and ratio < 1:
+            self.degrade('skipped_critic', 'review', budget_ratio=round(ratio, 2))
+            return True
+        return False
+
+    def run(self, step, fn):
+        """
+        Run one step, stopping it if the deadline passes or the budget is spent.
+
+        Args:
+            step (str): Step name
+            fn (callable): Runs the step and returns its crew output
+
+        Returns:
+            The crew output
+
+        Raises:
+            BudgetExhausted: If the budget is spent before or during the step
+        """
+        if self.budget.exhausted():
+            self.degrade('partial_report', step, reason='budget_spent')
+            raise BudgetExhausted(f"budget spent before {step}")
+
+        guard = StepGuard(step, self.budget)
+
+        def guarded():
+            with use_step(guard):
+                return fn()
+
+        remaining = self.budget.remaining_seconds()
+        try:
+            if remaining is None:
+                output = guarded()
+            else:
+                # The step runs on a helper thread so the run can return at the
+                # deadline; an abandoned step stops at its next tool or LLM call
+                context = contextvars.copy_context()
+                outcome = {}
+                finished = threading.Event()
+
+                def target():
+                    try:
+                        outcome['output'] = context.run(guarded)
+                    except BaseException as e:
+                        outcome['error'] = e
+                    finally:
+                        finished.set()
+
+                thread = threading.Thread(target=target, name=f"research-{step}", daemon=True)
+                thread.start()
+                if not finished.wait(remaining):
+                    self.budget.cancel()
+                    self.budget.abandon(thread)
+                    self.degrade('partial_report', step, reason='deadline')
+                    raise BudgetExhausted(f"deadline passed during {step}")
+                if 'error' in outcome:
+                    raise outcome['error']
+                output = outcome['output']
+        except StepCancelled as e:
+            self.degrade('partial_report', step, reason=guard.reason or 'cancelled')
+            raise BudgetExhausted(str(e)) from e
+
+        guard.finish(output)
+        return output
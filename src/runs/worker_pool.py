@@ -0,0 +1,220 @@
+"""Pool of pre-warmed worker processes for research runs.
+
+Starting a fresh process for a run re-imports crewai, langchain, litellm and
+the provider SDKs and re-reads the configuration, which takes seconds before
+any useful work happens. The pool starts its workers from a fork server that
+has imported those modules once (``PRELOAD_MODULES``), so each worker starts
+with them already loaded. Every worker then calls :func:`warm_up` to parse
+``agents_config.yaml`` and create its LLM client, and waits for jobs on a
+local queue.
+
+Progress events, status and metrics flow back over a result queue into
+ordinary :class:`RunHandle` objects, so the pool is a drop-in replacement
+for the thread-based :class:`RunManager` (``RESEARCH_POOL=process``). Worker
+startup time and job dispatch latency are reported by :meth:`WorkerPool.stats`
+and in each run's metrics.
+
+Where ``forkserver`` is unavailable (Windows), workers are spawned instead.
+They still warm up once and serve many runs.
+"""
+
+import atexit
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+
+from .manager import RunManager, RunHandle, execute_run, RUNNING, FAILED
+
+# Imported once by the fork server; workers fork with these already loaded.
+# Packages that are not installed are skipped.
+PRELOAD_MODULES = [
+    'crewai',
+    'litellm',
+    'langchain_core',
+    'langchain_community',
+    'langchain_groq',
+    'langchain_openai',
+    'langchain_google_genai',
+    'duckduckgo_search',
+    'requests',
+    'yaml',
+]
+
+# Dispatch latencies kept for the pool statistics
+DISPATCH_SAMPLES = 200
+
+# Seconds the listener waits for results before checking worker health
+HEALTH_CHECK_INTERVAL = 1.0
+
+
+def _get_context():
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(PRELOAD_MODULES)
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+def _summarize(values):
+    if not values:
+        return None
+    values = sorted(values)
+    return {
+        'count': len(values),
+        'p50': round(values[len(values) // 2], 3),
+        'p95': round(values[min(len(values) - 1, int(len(values) * 0.95))], 3),
+        'max': round(values[-1], 3)
+    }
+
+
+class _ForwardingHandle(RunHandle):
+    """Worker-side handle that forwards progress events to the parent."""
+
+    def __init__(self, results, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._results = results
+
+    def add_event(self, message, **data):
+        super().add_event(message, **data)
+        self._results.put(('event', os.getpid(), self.run_id, message, data))
+
+
+def _worker_main(jobs, results, spawned_at):
+    """Worker process: warm up once, then run jobs until told to stop."""
+    from .resources import warm_up
+
+    try:
+        warm_up_seconds = warm_up()
+    except Exception as e:
+        # Runs will report the same error; the worker stays available
+        print(f"⚠ Worker warm-up failed: {str(e)}")
+        warm_up_seconds = None
+    results.put(('ready', os.getpid(), time.time() - spawned_at, warm_up_seconds))
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        run_id, topic, research_depth, profile, deadline_seconds, max_tokens, submitted_at = job
+        results.put(('started', os.getpid(), run_id, time.time() - submitted_at))
+
+        handle = _ForwardingHandle(results, run_id, topic, research_depth, profile=profile,
+                                   deadline_seconds=deadline_seconds, max_tokens=max_tokens,
+                                   submitted_at=submitted_at)
+        try:
+            execute_run(handle)
+        except Exception:
+            traceback.print_exc()
+        results.put(('done', os.getpid(), run_id, handle.to_dict()))
+
+
+class WorkerPool(RunManager):
+    """Runs research in pre-warmed worker processes fed over a local queue."""
+
+    def _start_pool(self):
+        self._context = _get_context()
+        self._jobs = self._context.Queue()
+        self._results = self._context.Queue()
+        self._workers = {}
+        self._busy = {}
+        self._closed = False
+        self.startup_seconds = {}
+        self.warm_up_seconds = {}
+        self.dispatch_latencies = deque(maxlen=DISPATCH_SAMPLES)
+
+        for _ in range(self.max_workers):
+            self._spawn()
+        threading.Thread(target=self._listen, name="worker-pool", daemon=True).start()
+        atexit.register(self.close)
+
+    def _spawn(self):
+        process = self._context.Process(
+            target=_worker_main, args=(self._jobs, self._results, time.time()),
+            name="research-worker", daemon=True
+        )
+        process.start()
+        self._workers[process.pid] = process
+
+    def _start(self, handle):
+        self._jobs.put((handle.run_id, handle.topic, handle.research_depth, handle.profile,
+                        handle.deadline_seconds, handle.max_tokens, handle.submitted_at))
+
+    def _listen(self):
+        while not self._closed:
+            try:
+                message = self._results.get(timeout=HEALTH_CHECK_INTERVAL)
+            except queue.Empty:
+                self._reap()
+                continue
+
+            kind, pid = message[0], message[1]
+            if kind == 'ready':
+                self.startup_seconds[pid] = message[2]
+                self.warm_up_seconds[pid] = message[3]
+                print(f"✓ Research worker {pid} ready in {message[2]:.2f}s")
+                continue
+
+            handle = self.get(message[2])
+            if kind == 'started':
+                self._busy[pid] = message[2]
+                self.dispatch_latencies.append(message[3])
+                if handle is not None:
+                    handle.metrics['dispatch_latency_seconds'] = round(message[3], 3)
+                    handle.metrics['worker_pid'] = pid
+                    handle._set_status(RUNNING, started_at=datetime.now().isoformat(timespec='seconds'))
+            elif kind == 'event' and handle is not None:
+                handle.add_event(message[3], **message[4])
+            elif kind == 'done':
+                self._busy.pop(pid, None)
+                if handle is not None:
+                    snapshot = message[3]
+                    handle.metrics.update(snapshot['metrics'])
+                    handle._set_status(snapshot['status'], report_path=snapshot['report_path'],
+                                       error=snapshot['error'], finished_at=snapshot['finished_at'])
+
+    def _reap(self):
+        """Fail the runs of workers that died and replace the workers."""
+        for pid, process in list(self._workers.items()):
+            if process.is_alive():
+                continue
+            del self._workers[pid]
+            run_id = self._busy.pop(pid, None)
+            handle = self.get(run_id) if run_id else None
+            if handle is not None and not handle.done:
+                error = f"Worker process exited unexpectedly (exit code {process.exitcode})"
+                handle.add_event(f"❌ Error during research: {error}")
+                handle._set_status(FAILED, error=error,
+                                   finished_at=datetime.now().isoformat(timespec='seconds'))
+            if not self._closed:
+                self._spawn()
+
+    def stats(self):
+        """Pool size, worker startup times and job dispatch latency."""
+        stats = super().stats()
+        stats.update({
+            'pool': 'process',
+            'start_method': self._context.get_start_method(),
+            'workers_alive': sum(process.is_alive() for process in list(self._workers.values())),
+            'workers_ready': sum(pid in self.startup_seconds for pid in list(self._workers)),
+            'startup_seconds': _summarize(list(self.startup_seconds.values())),
+            'warm_up_seconds': _summarize([s for s in self.warm_up_seconds.values() if s is not None]),
+            'dispatch_latency_seconds': _summarize(list(self.dispatch_latencies))
+        })
+        return stats
+
+    def close(self, timeout=10):
+        """Stop the workers once they finish their current run."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._workers:
+            self._jobs.put(None)
+        for process in list(self._workers.values()):
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
@@ -1,4 +1,4 @@
 # Tasks package
-from .research_tasks import create_research_tasks
+from .research_tasks import create_research_tasks, TASK_AGENTS
 
-__all__ = ['create_research_tasks']
+__all__ = ['create_research_tasks', 'TASK_AGENTS']
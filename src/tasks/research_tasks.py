@@ -2,7 +2,34 @@
 
 from crewai import Task
 
-def create_research_tasks(agents, task_config, topic):
+# Task keys in execution order, with the agent running each task
+TASK_AGENTS = {
+    'research': 'researcher',
+    'analyze': 'analyzer',
+    'write': 'writer',
+    'review': 'critic'
+}
+
+# Tasks whose output each task receives as context
+TASK_CONTEXT = {
+    'research': [],
+    'analyze': ['research'],                # Depends on research task
+    'write': ['research', 'analyze'],       # Depends on both previous tasks
+    'review': ['write']                     # Depends on writing task
+}
+
+def _make_callback(task_callback, task_key):
+    """Wrap a ``task_callback(task_key, output)`` hook as a crewai task callback."""
+    if task_callback is None:
+        return None
+    
+    def callback(output):
+        task_callback(task_key, str(output))
+    
+    return callback
+
+def create_research_tasks(agents, task_config, topic, task_callback=None, completed=None,
+                          task_keys=None, notes=None):
     """
     Create all research tasks for the crew.
     
@@ -10,40 +37,45 @@ def create_research_tasks(agents, task_config, topic):
         agents (dict): Dictionary of agent instances
         task_config (dict): Task configuration from YAML
         topic (str): Research topic
+        task_callback (callable): Optional hook called as
+            ``task_callback(task_key, output)`` when each task completes
+        completed (dict): Outputs of tasks finished in an earlier attempt,
+            keyed by task key. These tasks are skipped and their outputs are
+            passed to the remaining tasks as context.
+        task_keys (list): Only create these tasks (default: all remaining)
+        notes (dict): Extra instructions appended to task descriptions,
+            keyed by task key (e.g. a shorter report when time is short)
     
     Returns:
-        list: List of Task instances
+        list: List of Task instances still to run
     """
+    completed = completed or {}
+    notes = notes or {}
+    tasks = {}
     
-    # Research Task
-    research_task = Task(
-        description=task_config.get('research', {}).get('description', '').format(topic=topic),
-        agent=agents['researcher'],
-        expected_output=task_config.get('research', {}).get('expected_output', ''),
-    )
-    
-    # Analysis Task
-    analysis_task = Task(
-        description=task_config.get('analyze', {}).get('description', '').format(topic=topic),
-        agent=agents['analyzer'],
-        expected_output=task_config.get('analyze', {}).get('expected_output', ''),
-        context=[research_task]  # Depends on research task
-    )
-    
-    # Writing Task
-    writing_task = Task(
-        description=task_config.get('write', {}).get('description', '').format(topic=topic),
-        agent=agents['writer'],
-        expected_output=task_config.get('write', {}).get('expected_output', ''),
-        context=[research_task, analysis_task]  # Depends on both previous tasks
-    )
-    
-    # Review Task
-    review_task = Task(
-        description=task_config.get('review', {}).get('description', '').format(topic=topic),
-        agent=agents['critic'],
-        expected_output=task_config.get('review', {}).get('expected_output', ''),
-        context=[writing_task]  # Depends on writing task
-    )
+    for task_key, agent_key in TASK_AGENTS.items():
+        if task_key in completed or (task_keys is not None and task_key not in task_keys):
+            continue
+        
+        config = task_config.get(task_key, {})
+        description = config.get('description', '').format(topic=topic)
+        if notes.get(task_key):
+            description += f"\n\n{notes[task_key]}"
+        
+        # Earlier outputs restored from a checkpoint are inlined as context
+        restored = [key for key in TASK_CONTEXT[task_key] if key in completed]
+        for key in restored:
+            description += (
+                f"\n\nOutput of the completed '{key}' step "
+                f"(use it as context):\n{completed[key]}"
+            )
+        
+        tasks[task_key] = Task(
+            description=description,
+            agent=agents[agent_key],
+            expected_output=config.get('expected_output', ''),
+            context=[tasks[key] for key in TASK_CONTEXT[task_key] if key not in completed] or None,
+            callback=_make_callback(task_callback, task_key),
+        )
     
-    return [research_task, analysis_task, writing_task, review_task]
+    return list(tasks.values())
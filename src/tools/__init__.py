@@ -2,6 +2,11 @@
 from .search_tool import search_tool, create_search_tool
 from .scraping_tool import scraping_tool, create_scraping_tool
 from .processing_tool import processing_tool, create_processing_tool
+from .dedup import ContentDeduplicator, canonicalize_url, use_deduplicator
+from .search_backends import SearchBackend, get_backends, run_search
+from .prefetch import Prefetcher, use_prefetcher
+from .novelty import NoveltyTracker, use_novelty_tracker
+from .http_resilience import CircuitOpenError, get_host_registry
 
 __all__ = [
     'search_tool',
@@ -9,5 +14,17 @@ __all__ = [
     'scraping_tool',
     'create_scraping_tool',
     'processing_tool',
-    'create_processing_tool'
+    'create_processing_tool',
+    'ContentDeduplicator',
+    'canonicalize_url',
+    'use_deduplicator',
+    'SearchBackend',
+    'get_backends',
+    'run_search',
+    'Prefetcher',
+    'use_prefetcher',
+    'NoveltyTracker',
+    'use_novelty_tracker',
+    'CircuitOpenError',
+    'get_host_registry'
 ]
@@ -0,0 +1,278 @@
+"""URL canonicalization and near-duplicate detection for scraped pages.
+
+Search results often point at mirrors, syndicated copies and AMP variants of
+the same article. Two checks keep only one copy in the agents' context:
+
+- before scraping, URLs are reduced to a canonical form (scheme, ``www.``,
+  AMP markers, tracking parameters and fragments are ignored)
+- after extraction, page text is fingerprinted with a 64-bit SimHash.
+  Pages within ``max_distance`` bits of a collected page are candidates, and
+  a candidate is confirmed as a near-duplicate when most of the word 3-gram
+  shingles of the shorter page also occur in the other one. SimHash alone
+  either misses copies with an added header or a few edited sentences, or
+  flags unrelated pages once its threshold is loose enough to catch them.
+"""
+
+import hashlib
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that never change page content
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid',
+    'ref', 'ref_src', 'ref_url', 'referrer', 'spm', 'cmpid',
+    'amp', 'amp_js_v', 'usqp', 'outputtype', '_ga', '_gl'
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'hsa_', 'oly_')
+
+HOST_PREFIXES = ('www.', 'm.', 'mobile.', 'amp.')
+
+AMP_CACHE_SUFFIX = '.cdn.ampproject.org'
+
+SIMHASH_BITS = 64
+# Pages whose SimHash differs in at most this many bits are compared shingle by
+# shingle. Copies with a boilerplate header/footer, 10-20 edited words or a
+# truncated body measure 0-20 bits; unrelated pages average 30.
+DEFAULT_MAX_DISTANCE = 20
+# Share of the shorter page's shingles found in the other page above which
+# the two are near-duplicates
+DEFAULT_MIN_OVERLAP = 0.7
+
+# Pages kept by the shared deduplicator used outside a research run
+FALLBACK_MAX_PAGES = 200
+
+
+def canonicalize_url(url):
+    """
+    Reduce a URL to a canonical form shared by its mirrors and variants.
+
+    Args:
+        url (str): URL as returned by a search engine or the agent
+
+    Returns:
+        str: Canonical URL used as deduplication key
+    """
+    url = url.strip()
+    if '://' not in url:
+        url = 'http://' + url
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    path = parts.path or '/'
+
+    # Google AMP cache: https://<host>.cdn.ampproject.org/c/s/<host>/<path>
+    if host.endswith(AMP_CACHE_SUFFIX):
+        match = re.match(r'^/[a-z](?:/s)?/([^/]+)(/.*)?$', path)
+        if match:
+            host = match.group(1).lower()
+            path = match.group(2) or '/'
+
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    # AMP path variants: /amp/..., .../amp, .../article.amp.html
+    path = re.sub(r'/amp(?=/|$)', '', path, flags=re.IGNORECASE)
+    path = re.sub(r'\.amp(\.html?)$', r'\1', path, flags=re.IGNORECASE)
+    path = re.sub(r'/index\.(html?|php)$', '/', path, flags=re.IGNORECASE)
+    path = re.sub(r'/{2,}', '/', path)
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+
+    # Scheme and fragment never distinguish content
+    return urlunsplit(('https', host, path or '/', urlencode(query), ''))
+
+
+def _tokens(text):
+    return re.findall(r'\w+', text.lower())
+
+
+def shingles(text):
+    """Word 3-gram shingles of a text (single words for very short texts)."""
+    words = _tokens(text)
+    if len(words) < 3:
+        return set(words)
+    return {' '.join(words[i:i + 3]) for i in range(len(words) - 2)}
+
+
+def overlap(a, b):
+    """Share of the smaller shingle set that is contained in the other one."""
+    if not a or not b:
+        return 0.0
+    if len(a) > len(b):
+        a, b = b, a
+    return len(a & b) / len(a)
+
+
+def simhash(text, bits=SIMHASH_BITS):
+    """
+    Compute a SimHash fingerprint over word 3-gram shingles.
+
+    Args:
+        text (str): Page text
+        bits (int): Fingerprint size
+
+    Returns:
+        int: Fingerprint
+    """
+    return _simhash(shingles(text), bits)
+
+
+def _simhash(shingles, bits=SIMHASH_BITS):
+    weights = [0] * bits
+    for shingle in shingles:
+        digest = int.from_bytes(
+            hashlib.blake2b(shingle.encode('utf-8'), digest_size=bits // 8).digest(), 'big')
+        for bit in range(bits):
+            if digest >> bit & 1:
+                weights[bit] += 1
+            else:
+                weights[bit] -= 1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a, b):
+    """Number of differing bits between two fingerprints."""
+    return bin(a ^ b).count('1')
+
+
+class ContentDeduplicator:
+    """Tracks the URLs and page fingerprints already collected in a run."""
+
+    def __init__(self, max_distance=DEFAULT_MAX_DISTANCE, min_overlap=DEFAULT_MIN_OVERLAP,
+                 max_pages=None):
+        """
+        Args:
+            max_distance (int): Maximum SimHash distance of near-duplicate candidates
+            min_overlap (float): Minimum shingle overlap confirming a near-duplicate
+            max_pages (int): Pages remembered before the oldest are forgotten
+                (default: unbounded)
+        """
+        self.max_distance = max_distance
+        self.min_overlap = min_overlap
+        self.max_pages = max_pages
+        self._lock = threading.Lock()
+        self._urls = {}
+        self._fingerprints = {}
+        self._shingles = {}
+        # Text of every unique page collected, in scrape order
+        self.pages = {}
+        self.skipped_urls = 0
+        self.skipped_pages = 0
+
+    def seen_url(self, url, count=True):
+        """
+        Check whether a URL (or a variant of it) was already collected.
+
+        Args:
+            url (str): URL about to be scraped
+            count (bool): Count a hit as a skipped fetch
+
+        Returns:
+            str: URL of the collected copy, or None
+        """
+        with self._lock:
+            original = self._urls.get(canonicalize_url(url))
+            if original is not None and count:
+                self.skipped_urls += 1
+            return original
+
+    def add_page(self, url, text):
+        """
+        Register a scraped page unless it duplicates one already collected.
+
+        Args:
+            url (str): URL the page was scraped from
+            text (str): Extracted page text
+
+        Returns:
+            str: URL of the page this one duplicates, or None if it is new
+        """
+        canonical = canonicalize_url(url)
+        page_shingles = shingles(text)
+        fingerprint = _simhash(page_shingles)
+
+        with self._lock:
+            if canonical in self._urls:
+                self.skipped_urls += 1
+                return self._urls[canonical]
+
+            # A run collects tens of pages, so a linear scan is cheap
+            for candidate, candidate_fingerprint in self._fingerprints.items():
+                if (hamming_distance(fingerprint, candidate_fingerprint) <= self.max_distance
+                        and overlap(page_shingles, self._shingles[candidate]) >= self.min_overlap):
+                    # Remember the variant URL so it is not fetched again
+                    self._urls[canonical] = candidate
+                    self.skipped_pages += 1
+                    return candidate
+
+            self._urls[canonical] = url
+            self._fingerprints[url] = fingerprint
+            self._shingles[url] = page_shingles
+            self.pages[url] = text
+            if self.max_pages is not None and len(self.pages) > self.max_pages:
+                self._forget(next(iter(self.pages)))
+            return None
+
+    def _forget(self, url):
+        del self.pages[url]
+        del self._fingerprints[url]
+        del self._shingles[url]
+        for canonical in [key for key, value in self._urls.items() if value == url]:
+            del self._urls[canonical]
+
+
+_fallback_deduplicator = ContentDeduplicator(max_pages=FALLBACK_MAX_PAGES)
+_fallback_warned = False
+_current_deduplicator = ContextVar('current_deduplicator', default=None)
+
+
+def get_deduplicator():
+    """
+    Return the deduplicator of the current research run.
+
+    Tools called outside a run (or from a thread that did not inherit the
+    run's context) share a bounded fallback instance instead.
+    """
+    global _fallback_warned
+    deduplicator = _current_deduplicator.get()
+    if deduplicator is not None:
+        return deduplicator
+    if not _fallback_warned:
+        _fallback_warned = True
+        print("⚠ Deduplication used outside a research run; "
+              f"sharing a fallback that keeps the last {FALLBACK_MAX_PAGES} pages")
+    return _fallback_deduplicator
+
+
+@contextmanager
+def use_deduplicator(deduplicator=None):
+    """
+    Scope URL and content deduplication to a single research run.
+
+    Args:
+        deduplicator (ContentDeduplicator): Instance to use (default: a new one)
+    """
+    if deduplicator is None:
+        deduplicator = ContentDeduplicator()
+    token = _current_deduplicator.set(deduplicator)
+    try:
+        yield deduplicator
+    finally:
+        _current_deduplicator.reset(token)
@@ -0,0 +1,340 @@
+"""Per-host circuit breakers, retries and hedged requests for page fetches.
+
+Scrapes used a flat timeout and no retry policy: a dead host cost the full
+timeout every time a search returned it, and a transient error went straight
+back to the agent, which then often retried the same URL. Fetches now go
+through :func:`call_with_resilience`, which
+
+- tracks the health of every host and opens a circuit breaker after
+  ``CIRCUIT_FAILURES`` consecutive failed fetches (a fetch fails once, after
+  its retries); requests to an open host fail immediately for
+  ``CIRCUIT_COOLDOWN`` seconds, then a single trial fetch decides whether it
+  closes again
+- retries timeouts, connection errors, 429 and 5xx responses up to
+  ``SCRAPE_RETRIES`` times with exponential backoff and full jitter
+- optionally hedges a slow attempt with a second identical request once it
+  has taken longer than recent fetches usually do (``SCRAPE_HEDGE``); the
+  attempt itself runs on the caller's thread and the hedge on a small pool,
+  whose result is used if the attempt fails or times out. At most
+  ``SCRAPE_MAX_HEDGES`` hedges run at once; when all are busy the attempt
+  is simply not hedged
+
+Every attempt, backoff and hedge shares one deadline (``SCRAPE_MAX_SECONDS``),
+which bounds the tail latency of a single scrape.
+"""
+
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+
+from src.utils.profiling import blocking_span
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# HTTP statuses worth retrying; other client errors are permanent
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Successful fetch latencies kept for the hedge delay estimate
+LATENCY_SAMPLES = 50
+MIN_LATENCY_SAMPLES = 10
+
+# Hedges in flight; the pool has a thread per slot, so a hedge never queues
+_max_hedges = max(1, int(os.getenv("SCRAPE_MAX_HEDGES", 2)))
+_hedge_slots = threading.BoundedSemaphore(_max_hedges)
+_executor = ThreadPoolExecutor(max_workers=_max_hedges, thread_name_prefix="hedge")
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised when a host's circuit breaker is open and requests are not sent."""
+
+
+def get_host(url):
+    """Host name used as circuit breaker key."""
+    return (urlsplit(url).hostname or '').lower()
+
+
+def is_retryable(error):
+    """
+    Check whether a failed fetch is worth retrying.
+
+    Args:
+        error (Exception): Error raised by the fetch
+
+    Returns:
+        bool: True for timeouts, connection errors, 429 and 5xx responses
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError):
+        response = getattr(error, 'response', None)
+        return response is not None and response.status_code in RETRYABLE_STATUSES
+    return False
+
+
+def backoff_delay(attempt, base=None, cap=None):
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempt (int): Number of the retry (0 for the first retry)
+        base (float): Base delay in seconds (default: SCRAPE_BACKOFF_BASE or 0.5)
+        cap (float): Maximum delay in seconds (default: SCRAPE_BACKOFF_CAP or 8)
+
+    Returns:
+        float: Seconds to sleep before the retry
+    """
+    if base is None:
+        base = float(os.getenv("SCRAPE_BACKOFF_BASE", 0.5))
+    if cap is None:
+        cap = float(os.getenv("SCRAPE_BACKOFF_CAP", 8))
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class HostHealth:
+    """Circuit breaker state of a single host."""
+
+    def __init__(self, host):
+        self.host = host
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def allow(self, cooldown, now):
+        """Check whether a request may be sent; moves open circuits to half-open."""
+        if self.state == OPEN:
+            if now - self.opened_at < cooldown:
+                return False
+            self.state = HALF_OPEN
+            self.trial_in_flight = False
+        if self.state == HALF_OPEN:
+            # Only a single trial request probes a recovering host
+            if self.trial_in_flight:
+                return False
+            self.trial_in_flight = True
+        return True
+
+
+class HostRegistry:
+    """Process-wide health of every host fetched, plus resilience counters."""
+
+    def __init__(self, max_failures=None, cooldown=None):
+        """
+        Args:
+            max_failures (int): Consecutive failures that open a circuit
+                (default: CIRCUIT_FAILURES or 3)
+            cooldown (float): Seconds an open circuit rejects requests
+                (default: CIRCUIT_COOLDOWN or 60)
+        """
+        self.max_failures = max_failures if max_failures is not None else int(os.getenv("CIRCUIT_FAILURES", 3))
+        self.cooldown = cooldown if cooldown is not None else float(os.getenv("CIRCUIT_COOLDOWN", 60))
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.hedges_skipped = 0
+        self.rejected = 0
+
+    def _health(self, host):
+        health = self._hosts.get(host)
+        if health is None:
+            health = self._hosts[host] = HostHealth(host)
+        return health
+
+    def before_request(self, host):
+        """
+        Admit a request to a host.
+
+        Raises:
+            CircuitOpenError: If the host's circuit is open
+        """
+        with self._lock:
+            if not self._health(host).allow(self.cooldown, time.monotonic()):
+                self.rejected += 1
+                raise CircuitOpenError(f"{host} is failing repeatedly, requests are paused")
+
+    def record_success(self, host, latency=None):
+        with self._lock:
+            health = self._health(host)
+            health.state = CLOSED
+            health.failures = 0
+            health.trial_in_flight = False
+            if latency is not None:
+                self._latencies.append(latency)
+
+    def record_failure(self, host):
+        with self._lock:
+            health = self._health(host)
+            health.failures += 1
+            health.trial_in_flight = False
+            if health.state == HALF_OPEN or health.failures >= self.max_failures:
+                health.state = OPEN
+                health.opened_at = time.monotonic()
+
+    def record_abandoned(self, host):
+        """Forget a request given up on locally, without judging the host."""
+        with self._lock:
+            self._health(host).trial_in_flight = False
+
+    def count(self, counter):
+        """Increment one of the resilience counters."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def hedge_delay(self):
+        """
+        Seconds after which a slow fetch is hedged.
+
+        Uses the 90th percentile of recent fetch latencies once enough
+        samples exist, otherwise ``SCRAPE_HEDGE_DELAY``.
+        """
+        default = float(os.getenv("SCRAPE_HEDGE_DELAY", 3.0))
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return default
+        return samples[int(len(samples) * 0.9)]
+
+    def stats(self):
+        """Resilience counters and the hosts whose circuit is not closed."""
+        with self._lock:
+            return {
+                'retries': self.retries,
+                'hedges': self.hedges,
+                'hedge_wins': self.hedge_wins,
+                'hedges_skipped': self.hedges_skipped,
+                'rejected': self.rejected,
+                'open_hosts': sorted(h.host for h in self._hosts.values() if h.state != CLOSED)
+            }
+
+
+_registry = HostRegistry()
+
+
+def get_host_registry():
+    """Return the process-wide host registry."""
+    return _registry
+
+
+def _attempt(fetch, timeout, hedge, registry):
+    """
+    Run one attempt, hedging it with a second request if it is slow.
+
+    The attempt runs on the caller's thread, so it never waits for a pool
+    thread and its timeout is spent on the host alone. If it is still running
+    after the hedge delay, a timer starts the same fetch on the hedge pool;
+    should the attempt then fail, the hedge's result is used instead.
+    """
+    if not hedge:
+        return fetch(timeout)
+
+    started = time.monotonic()
+    lock = threading.Lock()
+    state = {'finished': False, 'hedge': None}
+
+    def start_hedge():
+        with lock:
+            if state['finished']:
+                return
+            if not _hedge_slots.acquire(blocking=False):
+                registry.count('hedges_skipped')
+                return
+            registry.count('hedges')
+            state['hedge'] = _executor.submit(fetch, max(0.1, timeout - (time.monotonic() - started)))
+            state['hedge'].add_done_callback(lambda _: _hedge_slots.release())
+
+    timer = threading.Timer(registry.hedge_delay(), start_hedge)
+    timer.daemon = True
+    timer.start()
+    try:
+        return fetch(timeout)
+    except Exception as primary_error:
+        with lock:
+            state['finished'] = True
+            backup = state['hedge']
+        if backup is None:
+            raise
+        try:
+            result = backup.result(timeout=max(0.0, timeout - (time.monotonic() - started)))
+        except Exception:
+            # The hedge failed or is still running; report the attempt's own error
+            raise primary_error
+        registry.count('hedge_wins')
+        return result
+    finally:
+        timer.cancel()
+        with lock:
+            state['finished'] = True
+
+
+def call_with_resilience(url, fetch, deadline=None):
+    """
+    Run a fetch with circuit breaking, retries with backoff and hedging.
+
+    The fetch counts once towards the host's circuit breaker, whatever the
+    number of attempts, and running out of the caller's own deadline is not
+    held against the host.
+
+    Args:
+        url (str): URL being fetched (its host keys the circuit breaker)
+        fetch (callable): Called as ``fetch(timeout)`` to perform one attempt
+        deadline (float): ``time.monotonic()`` value by which to give up
+            (default: now + SCRAPE_MAX_SECONDS)
+
+    Returns:
+        The fetch result
+
+    Raises:
+        CircuitOpenError: If the host's circuit is open
+        Exception: The last fetch error once retries are exhausted
+    """
+    registry = get_host_registry()
+    host = get_host(url)
+    if deadline is None:
+        deadline = time.monotonic() + float(os.getenv("SCRAPE_MAX_SECONDS", 20))
+    retries = int(os.getenv("SCRAPE_RETRIES", 2))
+    hedge = os.getenv("SCRAPE_HEDGE", "true").lower() == "true"
+    request_timeout = float(os.getenv("SCRAPE_TIMEOUT", 10))
+
+    if deadline <= time.monotonic():
+        raise requests.exceptions.Timeout(f"deadline exceeded for {url}")
+    registry.before_request(host)
+
+    attempt = 0
+    while True:
+        started = time.monotonic()
+        timeout = min(request_timeout, deadline - started)
+        try:
+            result = _attempt(fetch, timeout, hedge, registry)
+        except Exception as e:
+            delay = backoff_delay(attempt)
+            if is_retryable(e) and attempt < retries and time.monotonic() + delay < deadline:
+                attempt += 1
+                registry.count('retries')
+                with blocking_span("backoff"):
+                    time.sleep(delay)
+                continue
+            if isinstance(e, requests.exceptions.Timeout) and timeout < request_timeout:
+                # The attempt was cut short by the caller's deadline, not the host
+                registry.record_abandoned(host)
+            elif is_retryable(e):
+                registry.record_failure(host)
+            else:
+                # The host answered; a 404 or an unsupported page says nothing about its health
+                registry.record_success(host)
+            raise
+
+        registry.record_success(host, time.monotonic() - started)
+        return result
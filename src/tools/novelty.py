@@ -0,0 +1,231 @@
+"""Novelty tracking and adaptive stopping for the research phase.
+
+Every scraped page is reduced to features: content-word bigrams, named
+entities and numeric facts. A page's gain is the weighted share of its
+features that no earlier page of the run contributed. Once the average gain
+of the last few pages drops below a threshold, the research has saturated.
+After that, the search and scraping tools stop fetching and tell the
+researcher to compile its findings.
+
+Narrow topics saturate after a handful of pages. Broad topics keep producing
+new entities and facts, so they run until ``max_iterations`` as before.
+
+Configured with ``NOVELTY_THRESHOLD`` (0 disables stopping),
+``NOVELTY_MIN_PAGES`` and ``NOVELTY_WINDOW``. The run scheduler can also
+stop the research phase early through :meth:`NoveltyTracker.limit` when the
+run's time or token budget is short.
+"""
+
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Facts and entities say more about coverage than wording does
+FEATURE_WEIGHTS = {'ngrams': 1.0, 'entities': 2.0, 'numbers': 3.0}
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'been', 'but', 'by', 'can', 'for',
+    'from', 'has', 'have', 'he', 'her', 'his', 'i', 'if', 'in', 'into', 'is', 'it',
+    'its', 'more', 'most', 'not', 'of', 'on', 'or', 'our', 'she', 'so', 'such',
+    'than', 'that', 'the', 'their', 'them', 'then', 'there', 'these', 'they',
+    'this', 'those', 'to', 'was', 'we', 'were', 'what', 'when', 'which', 'while',
+    'who', 'will', 'with', 'would', 'you', 'your', 'also', 'about', 'all', 'one'
+}
+
+ENTITY_PATTERN = re.compile(r"\b[A-Z][\w'-]*(?:\s+(?:of\s+|the\s+)?[A-Z][\w'-]*)*")
+NUMBER_PATTERN = re.compile(
+    r"\b\d[\d,]*(?:\.\d+)?\s*(?:%|percent|million|billion|trillion|thousand|"
+    r"bn|m|k|kg|km|gb|tb|mw|gw|usd|eur)?\b",
+    re.IGNORECASE
+)
+
+
+def extract_features(text):
+    """
+    Reduce page text to the features used for novelty scoring.
+
+    Args:
+        text (str): Extracted page text
+
+    Returns:
+        dict: Feature sets keyed by ``ngrams``, ``entities`` and ``numbers``
+    """
+    words = [word for word in re.findall(r'[a-z][a-z-]+', text.lower()) if word not in STOPWORDS]
+    ngrams = {f"{words[i]} {words[i + 1]}" for i in range(len(words) - 1)}
+
+    entities = set()
+    for match in ENTITY_PATTERN.findall(text):
+        entity = ' '.join(match.split()).lower()
+        # Single capitalized stopwords are mostly sentence starts
+        if entity not in STOPWORDS and len(entity) > 2:
+            entities.add(entity)
+
+    numbers = set()
+    for match in NUMBER_PATTERN.findall(text):
+        number = ' '.join(match.lower().replace(',', '').split())
+        # Bare one- and two-digit numbers are list markers and dates, not facts
+        if not number.isdigit() or len(number) > 2:
+            numbers.add(number)
+
+    return {'ngrams': ngrams, 'entities': entities, 'numbers': numbers}
+
+
+class NoveltyTracker:
+    """Scores how much new content each page adds to a research run."""
+
+    def __init__(self, threshold=None, min_pages=None, window=None):
+        """
+        Args:
+            threshold (float): Average gain below which research is saturated
+                (default: NOVELTY_THRESHOLD or 0.15, 0 disables stopping)
+            min_pages (int): Pages collected before stopping is considered
+                (default: NOVELTY_MIN_PAGES or 3)
+            window (int): Recent pages averaged for the decision
+                (default: NOVELTY_WINDOW or 2)
+        """
+        self.threshold = threshold if threshold is not None else float(os.getenv("NOVELTY_THRESHOLD", 0.15))
+        self.min_pages = min_pages if min_pages is not None else int(os.getenv("NOVELTY_MIN_PAGES", 3))
+        self.window = max(1, window if window is not None else int(os.getenv("NOVELTY_WINDOW", 2)))
+        self._lock = threading.Lock()
+        self._seen = {kind: set() for kind in FEATURE_WEIGHTS}
+        self.gains = []
+        self.saturated_after = None
+        self.stop_reason = None
+        self.refused = 0
+        self._stop_at = None
+        self._max_pages = None
+
+    @property
+    def saturated(self):
+        return self.saturated_after is not None
+
+    @property
+    def stop_message(self):
+        """Instruction for the agent once research has stopped."""
+        return SATURATED_MESSAGE if self.stop_reason == 'saturated' else BUDGET_MESSAGE
+
+    def limit(self, seconds=None, max_pages=None):
+        """
+        Stop the research phase after a time or page budget.
+
+        Args:
+            seconds (float): Seconds from now after which fetches are refused
+            max_pages (int): Pages after which fetches are refused
+        """
+        with self._lock:
+            if seconds is not None:
+                self._stop_at = time.monotonic() + max(0.0, seconds)
+            if max_pages is not None:
+                self._max_pages = max_pages
+
+    def stop(self, reason):
+        """Stop the research phase now (e.g. the run deadline passed)."""
+        with self._lock:
+            self._stop(reason)
+
+    def _stop(self, reason):
+        if self.saturated_after is None:
+            self.saturated_after = len(self.gains)
+            self.stop_reason = reason
+
+    def _check_budget(self):
+        if self._max_pages is not None and len(self.gains) >= self._max_pages:
+            self._stop('page_budget')
+        elif self._stop_at is not None and time.monotonic() >= self._stop_at:
+            self._stop('time_budget')
+
+    def add_page(self, text):
+        """
+        Register a scraped page and return its marginal gain.
+
+        Args:
+            text (str): Extracted page text
+
+        Returns:
+            float: Weighted share of the page's features that are new (0 to 1)
+        """
+        features = extract_features(text)
+
+        with self._lock:
+            new_weight = 0.0
+            total_weight = 0.0
+            for kind, weight in FEATURE_WEIGHTS.items():
+                new = features[kind] - self._seen[kind]
+                new_weight += weight * len(new)
+                total_weight += weight * len(features[kind])
+                self._seen[kind].update(new)
+
+            gain = new_weight / total_weight if total_weight else 0.0
+            self.gains.append(gain)
+
+            recent = self.gains[-self.window:]
+            if (self.threshold > 0 and not self.saturated
+                    and len(self.gains) >= max(self.min_pages, self.window)
+                    and sum(recent) / len(recent) < self.threshold):
+                self._stop('saturated')
+            self._check_budget()
+            return gain
+
+    def refuse(self):
+        """
+        Check whether a new fetch should be refused because research stopped.
+
+        Returns:
+            bool: True if the caller should not fetch
+        """
+        with self._lock:
+            self._check_budget()
+            if self.saturated_after is None:
+                return False
+            self.refused += 1
+            return True
+
+    def stats(self):
+        """Per-run novelty summary."""
+        with self._lock:
+            return {
+                'pages': len(self.gains),
+                'gains': [round(gain, 2) for gain in self.gains],
+                'saturated_after': self.saturated_after,
+                'stop_reason': self.stop_reason,
+                'fetches_avoided': self.refused
+            }
+
+
+SATURATED_MESSAGE = (
+    "Research has saturated: the last pages added little information that was not "
+    "already collected. Do not search or scrape further. Compile your findings from "
+    "the content gathered so far and give your final answer."
+)
+
+BUDGET_MESSAGE = (
+    "The research budget of this run is used up. Do not search or scrape further. "
+    "Compile your findings from the content gathered so far and give your final answer."
+)
+
+_current_tracker = ContextVar('current_novelty_tracker', default=None)
+
+
+def get_novelty_tracker():
+    """Return the novelty tracker of the current research run, or None."""
+    return _current_tracker.get()
+
+
+@contextmanager
+def use_novelty_tracker(tracker=None):
+    """
+    Scope novelty tracking and adaptive stopping to a single research run.
+
+    Args:
+        tracker (NoveltyTracker): Instance to use (default: a new one)
+    """
+    if tracker is None:
+        tracker = NoveltyTracker()
+    token = _current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current_tracker.reset(token)
@@ -0,0 +1,149 @@
+"""Speculative prefetching of top search hits.
+
+After a search returns, the researcher spends a full LLM round trip deciding
+which results to scrape. The prefetcher starts downloading and extracting the
+top results in the background right away, so the following scrape is served
+from the warm result (or joins the download already in flight).
+
+Prefetching is bounded by a process-wide worker pool (``PREFETCH_WORKERS``),
+the number of hits per search (``PREFETCH_TOP_K``) and the number of pages
+per run (``PREFETCH_MAX_PAGES``). Hit rate and waste are reported per run.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .dedup import canonicalize_url, get_deduplicator
+from src.utils.singleflight import coalesce
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PREFETCH_WORKERS", 2)),
+    thread_name_prefix="prefetch"
+)
+
+
+def _fetch(url):
+    from .scraping_tool import fetch_page_text
+
+    # Shares the download with a scrape of the same page started meanwhile
+    return coalesce("scrape", canonicalize_url(url), lambda: fetch_page_text(url))
+
+
+class Prefetcher:
+    """Per-run speculative fetcher with hit/waste accounting."""
+
+    def __init__(self, top_k=None, max_pages=None):
+        """
+        Args:
+            top_k (int): Results prefetched per search (default: PREFETCH_TOP_K or 3)
+            max_pages (int): Pages prefetched per run (default: PREFETCH_MAX_PAGES or 10)
+        """
+        self.top_k = top_k if top_k is not None else int(os.getenv("PREFETCH_TOP_K", 3))
+        self.max_pages = max_pages if max_pages is not None else int(os.getenv("PREFETCH_MAX_PAGES", 10))
+        self._lock = threading.Lock()
+        self._futures = {}
+        self._consumed = set()
+        self.issued = 0
+        self.hits = 0
+        self.hits_in_flight = 0
+        self.skipped = 0
+
+    def prefetch(self, urls):
+        """
+        Start fetching the top search hits in the background.
+
+        Args:
+            urls (list): Result URLs in rank order
+        """
+        deduplicator = get_deduplicator()
+        with self._lock:
+            for url in urls[:self.top_k]:
+                if not url.startswith(('http://', 'https://')):
+                    continue
+                key = canonicalize_url(url)
+                if key in self._futures or deduplicator.seen_url(url, count=False):
+                    continue
+                if self.issued >= self.max_pages:
+                    self.skipped += 1
+                    continue
+                self._futures[key] = _executor.submit(_fetch, url)
+                self.issued += 1
+
+    def take(self, url):
+        """
+        Claim the prefetched result for a URL.
+
+        Args:
+            url (str): URL about to be scraped
+
+        Returns:
+            Future: Completed or in-flight fetch, or None if not prefetched
+        """
+        key = canonicalize_url(url)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None or future.cancelled():
+                return None
+            if key not in self._consumed:
+                self._consumed.add(key)
+                self.hits += 1
+                if not future.done():
+                    self.hits_in_flight += 1
+        return future
+
+    def stats(self):
+        """
+        Prefetch effectiveness for the run so far.
+
+        Only prefetches that finished without being scraped count as wasted;
+        unclaimed ones still in flight may yet be used.
+        """
+        with self._lock:
+            unclaimed = [future for key, future in self._futures.items() if key not in self._consumed]
+            wasted = [future for future in unclaimed if future.done() and not future.cancelled()]
+            wasted_chars = sum(len(future.result()) for future in wasted if future.exception() is None)
+            return {
+                'issued': self.issued,
+                'hits': self.hits,
+                'hits_in_flight': self.hits_in_flight,
+                'in_flight': sum(1 for future in unclaimed if not future.done()),
+                'wasted': len(wasted),
+                'wasted_chars': wasted_chars,
+                'skipped_budget': self.skipped,
+                'hit_rate': round(self.hits / self.issued, 3) if self.issued else 0.0
+            }
+
+    def close(self):
+        """Cancel prefetches that have not started yet."""
+        with self._lock:
+            for future in self._futures.values():
+                future.cancel()
+
+
+_current_prefetcher = ContextVar('current_prefetcher', default=None)
+
+
+def get_prefetcher():
+    """Return the prefetcher of the current research run, or None."""
+    return _current_prefetcher.get()
+
+
+@contextmanager
+def use_prefetcher(prefetcher=None):
+    """
+    Enable speculative prefetching for a single research run.
+
+    Args:
+        prefetcher (Prefetcher): Instance to use (default: a new one)
+    """
+    if prefetcher is None:
+        prefetcher = Prefetcher()
+    token = _current_prefetcher.set(prefetcher)
+    try:
+        yield prefetcher
+    finally:
+        _current_prefetcher.reset(token)
+        prefetcher.close()
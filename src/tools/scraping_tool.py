@@ -1,57 +1,269 @@
 """Web scraping tool for extracting content from URLs."""
 
 from crewai.tools import tool
-import requests
-from bs4 import BeautifulSoup
+import codecs
+import os
 import re
+import time
+from html.parser import HTMLParser
+import requests
 
-@tool("Web Scraping Tool")
-def scraping_tool(url: str) -> str:
+from .dedup import canonicalize_url, get_deduplicator
+from .http_resilience import call_with_resilience, CircuitOpenError
+from .novelty import get_novelty_tracker
+from .prefetch import get_prefetcher
+from .search_backends import is_local_report, read_local_report
+from src.utils.cancellation import check_cancelled
+from src.utils.profiling import blocking_span
+from src.utils.singleflight import coalesce
+
+# Maximum characters of page text handed to the agent
+MAX_PAGE_CHARS = 5000
+
+# Content types worth downloading; anything else is aborted after the headers
+TEXT_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+
+# Elements whose text is never part of the main content
+SKIPPED_TAGS = {'script', 'style', 'nav', 'footer', 'header', 'noscript', 'svg', 'template'}
+
+# Elements that separate words when their text is joined
+BLOCK_TAGS = {
+    'p', 'div', 'br', 'li', 'ul', 'ol', 'tr', 'td', 'th', 'table', 'section',
+    'article', 'main', 'aside', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote', 'pre'
+}
+
+CHUNK_SIZE = 16 * 1024
+
+class UnsupportedContentError(Exception):
+    """Raised when a URL does not point at an HTML or plain-text page."""
+
+class _StreamingTextExtractor(HTMLParser):
+    """HTML parser that collects visible text incrementally and stops when full."""
+
+    def __init__(self, max_chars):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.parts = []
+        self.length = 0
+        self._skip_depth = 0
+
+    @property
+    def full(self):
+        return self.length >= self.max_chars
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append(' ')
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self.parts.append(' ')
+
+    def handle_data(self, data):
+        if self._skip_depth or self.full:
+            return
+        self.parts.append(data)
+        self.length += len(data.strip())
+
+    def text(self):
+        return ' '.join(''.join(self.parts).split())
+
+class _PlainTextExtractor:
+    """Plain-text counterpart of :class:`_StreamingTextExtractor`."""
+
+    def __init__(self, max_chars):
+        self.max_chars = max_chars
+        self.parts = []
+        self.length = 0
+
+    @property
+    def full(self):
+        return self.length >= self.max_chars
+
+    def feed(self, data):
+        if not self.full:
+            self.parts.append(data)
+            self.length += len(data)
+
+    def close(self):
+        pass
+
+    def text(self):
+        return ' '.join(''.join(self.parts).split())
+
+def _sniff_encoding(response, first_chunk):
+    """Pick the charset from the headers, a <meta> tag, or fall back to UTF-8."""
+    match = re.search(r'charset=["\']?([\w-]+)', response.headers.get('Content-Type', ''), re.IGNORECASE)
+    if match:
+        encoding = match.group(1)
+    else:
+        match = re.search(rb'<meta[^>]+charset=["\']?([\w-]+)', first_chunk[:2048], re.IGNORECASE)
+        encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = 'utf-8'
+    return encoding
+
+def _download_text(url, timeout, deadline, max_bytes):
+    """Download a page once and extract its text, stopping at the deadline."""
+    # Set headers to mimic a browser
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,text/plain;q=0.9,*/*;q=0.1'
+    }
+
+    # Fetch the page headers only; the body is streamed below
+    with requests.get(url, headers=headers, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+
+        content_type = response.headers.get('Content-Type', 'text/html').split(';')[0].strip().lower()
+        if content_type not in TEXT_CONTENT_TYPES:
+            raise UnsupportedContentError(f"unsupported content type {content_type}")
+
+        if content_type == 'text/plain':
+            extractor = _PlainTextExtractor(MAX_PAGE_CHARS)
+        else:
+            extractor = _StreamingTextExtractor(MAX_PAGE_CHARS)
+
+        decoder = None
+        received = 0
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(_sniff_encoding(response, chunk))(errors='replace')
+            chunk = chunk[:max_bytes - received]
+            received += len(chunk)
+            extractor.feed(decoder.decode(chunk))
+
+            if extractor.full or received >= max_bytes:
+                break
+            if time.monotonic() > deadline:
+                break
+
+        if decoder is not None:
+            extractor.feed(decoder.decode(b'', final=True))
+        extractor.close()
+
+    return extractor.text()
+
+def fetch_page_text(url):
     """
-    Scrape and extract main content from a web page.
-    
+    Fetch a web page and extract its main text content.
+
+    The body is streamed and decoded incrementally into the extractor, so
+    memory per scrape is bounded by ``SCRAPE_MAX_BYTES`` no matter how large
+    the resource is, and the download stops as soon as enough text has been
+    collected or ``SCRAPE_MAX_SECONDS`` have passed. Transient failures are
+    retried with backoff, slow downloads are hedged and hosts that keep
+    failing are skipped (see ``http_resilience``); all of it within the
+    same ``SCRAPE_MAX_SECONDS``.
+
+    Args:
+        url (str): The URL to fetch
+
+    Returns:
+        str: Extracted text content (at most 5000 characters)
+
+    Raises:
+        UnsupportedContentError: If the URL is not an HTML or text page
+        CircuitOpenError: If the host is failing repeatedly
+        requests.exceptions.RequestException: If the page cannot be fetched
+    """
+    max_bytes = int(os.getenv("SCRAPE_MAX_BYTES", 2 * 1024 * 1024))
+    max_seconds = float(os.getenv("SCRAPE_MAX_SECONDS", 20))
+    deadline = time.monotonic() + max_seconds
+
+    text = call_with_resilience(
+        url, lambda timeout: _download_text(url, timeout, deadline, max_bytes), deadline=deadline
+    )
+
+    # Limit text length
+    if len(text) > MAX_PAGE_CHARS:
+        text = text[:MAX_PAGE_CHARS] + "..."
+
+    return text
+
+def scrape_url(url):
+    """
+    Scrape a URL for the agents, skipping pages already collected in this run.
+
     Args:
         url (str): The URL to scrape
-    
+
     Returns:
-        str: Extracted text content from the page
+        str: Extracted page content, or a note/error message for the agent
+
+    Raises:
+        StepCancelled: If the run was stopped at its deadline or budget
     """
+    check_cancelled()
+    deduplicator = get_deduplicator()
+    tracker = get_novelty_tracker()
+
+    # Once new pages stop adding information the research phase is over
+    if tracker is not None and tracker.refuse():
+        return f"Skipped {url}: {tracker.stop_message}"
+
+    # Mirrors and AMP variants of an already collected page are never fetched
+    original = deduplicator.seen_url(url)
+    if original is not None:
+        return (f"Skipped {url}: same page as {original}, which was already scraped. "
+                f"Use the content collected earlier.")
+
+    # Served from a speculative prefetch when the search already started it
+    prefetcher = get_prefetcher()
+    prefetched = prefetcher.take(url) if prefetcher is not None else None
+
     try:
-        # Set headers to mimic a browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        # Fetch the page
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        # Parse HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
-        
-        # Get text content
-        text = soup.get_text()
-        
-        # Clean up text
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
-        
-        # Limit text length
-        if len(text) > 5000:
-            text = text[:5000] + "..."
-        
-        return f"Content from {url}:\n\n{text}"
-    
+        if is_local_report(url):
+            # Earlier report found by the local search backend
+            text = read_local_report(url, MAX_PAGE_CHARS)
+        elif prefetched is not None:
+            with blocking_span("prefetch_wait"):
+                text = prefetched.result()
+        else:
+            # Concurrent scrapes of the same page share a single download
+            with blocking_span("scrape"):
+                text = coalesce("scrape", canonicalize_url(url), lambda: fetch_page_text(url))
+    except UnsupportedContentError as e:
+        return f"Skipped {url}: {str(e)}, only HTML and text pages can be scraped."
+    except CircuitOpenError as e:
+        return f"Skipped {url}: {str(e)}. Use a different source."
     except requests.exceptions.RequestException as e:
-        return f"Error scraping {url}: {str(e)}"
+        return f"Error scraping {url}: {str(e)}. Do not retry this URL, use a different source."
     except Exception as e:
         return f"Error processing {url}: {str(e)}"
 
+    # Syndicated copies only enter the agent context once
+    duplicate_of = deduplicator.add_page(url, text)
+    if duplicate_of is not None:
+        return (f"Skipped {url}: content is a near-duplicate of {duplicate_of}, "
+                f"which was already scraped. Use the content collected earlier.")
+
+    content = f"Content from {url}:\n\n{text}"
+    if tracker is not None:
+        tracker.add_page(text)
+        if tracker.saturated:
+            content += f"\n\n{tracker.stop_message}"
+    return content
+
+@tool("Web Scraping Tool")
+def scraping_tool(url: str) -> str:
+    """
+    Scrape and extract main content from a web page.
+
+    Args:
+        url (str): The URL to scrape
+
+    Returns:
+        str: Extracted text content from the page
+    """
+    return scrape_url(url)
+
 def create_scraping_tool():
     """Create and return the scraping tool."""
     return scraping_tool
@@ -0,0 +1,287 @@
+"""Pluggable web search backends with concurrent multi-engine querying.
+
+Backends are selected with ``SEARCH_BACKENDS`` (comma separated, in priority
+order) and combined according to ``SEARCH_MODE``:
+
+- ``single``: only the first available backend is queried
+- ``parallel``: all backends are queried at once
+- ``hedged``: the first backend is queried, the others are only started if
+  it has not answered within ``SEARCH_HEDGE_DELAY`` seconds
+
+In ``parallel`` and ``hedged`` mode results are merged by canonical URL and
+reranked with reciprocal rank fusion, and the search returns as soon as
+enough unique results have arrived instead of waiting for the slowest engine.
+"""
+
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .dedup import canonicalize_url
+
+# Reciprocal rank fusion constant; dampens the weight of top ranks
+RRF_K = 60
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="search")
+
+
+class SearchBackend(ABC):
+    """Base class for search engines. Results are dicts with title, href and body."""
+
+    name = "base"
+
+    def available(self):
+        """Whether the backend is configured and can be queried."""
+        return True
+
+    @abstractmethod
+    def search(self, query, max_results):
+        """
+        Run a query against the engine.
+
+        Args:
+            query (str): The search query
+            max_results (int): Maximum number of results to return
+
+        Returns:
+            list: Result dicts with ``title``, ``href`` and ``body`` keys
+        """
+
+
+class DuckDuckGoBackend(SearchBackend):
+    """DuckDuckGo text search (no API key required)."""
+
+    name = "duckduckgo"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_request = 0.0
+
+    def search(self, query, max_results):
+        from duckduckgo_search import DDGS
+
+        # Space out requests to prevent rate limiting
+        request_delay = float(os.getenv("REQUEST_DELAY", 2.0))
+        with self._lock:
+            wait_time = self._last_request + request_delay - time.monotonic()
+            if wait_time > 0:
+                time.sleep(wait_time)
+            self._last_request = time.monotonic()
+
+        with DDGS() as ddgs:
+            return list(ddgs.text(query, max_results=max_results))
+
+
+class SerpApiBackend(SearchBackend):
+    """Google results through SerpAPI (requires SERPAPI_API_KEY)."""
+
+    name = "serpapi"
+
+    def available(self):
+        api_key = os.getenv("SERPAPI_API_KEY", "")
+        return bool(api_key) and not api_key.startswith("your_")
+
+    def search(self, query, max_results):
+        from serpapi import GoogleSearch
+
+        search = GoogleSearch({
+            "q": query,
+            "num": max_results,
+            "api_key": os.getenv("SERPAPI_API_KEY")
+        })
+        results = search.get_dict()
+        if "error" in results:
+            raise RuntimeError(results["error"])
+
+        return [
+            {
+                'title': result.get('title', 'N/A'),
+                'href': result.get('link', 'N/A'),
+                'body': result.get('snippet', 'N/A')
+            }
+            for result in results.get("organic_results", [])[:max_results]
+        ]
+
+
+# Scheme of the links LocalIndexBackend returns; the scraping tool reads
+# them from the report archive instead of the web
+LOCAL_REPORT_SCHEME = "report:"
+
+
+def is_local_report(url):
+    """Whether a URL points at an archived report (see LocalIndexBackend)."""
+    return url.strip().lower().startswith(LOCAL_REPORT_SCHEME)
+
+
+def read_local_report(url, max_chars=None):
+    """
+    Read an archived report linked by LocalIndexBackend.
+
+    Args:
+        url (str): ``report:<id>`` link
+        max_chars (int): Truncate the text to this many characters
+
+    Returns:
+        str: Report markdown
+
+    Raises:
+        LookupError: If the report is unknown or its file is gone
+    """
+    from src.utils.report_archive import get_report_archive
+
+    report_id = url.strip()[len(LOCAL_REPORT_SCHEME):].strip('/')
+    content = get_report_archive().read_content(int(report_id)) if report_id.isdigit() else None
+    if content is None:
+        raise LookupError(f"no archived report {report_id}")
+    if max_chars is not None and len(content) > max_chars:
+        content = content[:max_chars] + "..."
+    return content
+
+
+class LocalIndexBackend(SearchBackend):
+    """Offline search over previously generated reports in the report archive."""
+
+    name = "local"
+
+    def search(self, query, max_results):
+        from src.utils.report_archive import get_report_archive
+
+        return [
+            {
+                'title': f"Earlier report: {report['topic']}",
+                'href': f"{LOCAL_REPORT_SCHEME}{report['id']}",
+                'body': (report['summary'] or '')[:300]
+            }
+            for report in get_report_archive().search(query, limit=max_results)
+        ]
+
+
+BACKENDS = {
+    DuckDuckGoBackend.name: DuckDuckGoBackend,
+    SerpApiBackend.name: SerpApiBackend,
+    LocalIndexBackend.name: LocalIndexBackend
+}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_backend(name):
+    """Return the shared instance of a backend by name."""
+    with _instances_lock:
+        if name not in _instances:
+            if name not in BACKENDS:
+                raise ValueError(f"Unknown search backend: {name}")
+            _instances[name] = BACKENDS[name]()
+        return _instances[name]
+
+
+def get_backends(names=None):
+    """
+    Resolve the configured, available backends in priority order.
+
+    Args:
+        names (list): Backend names (default: SEARCH_BACKENDS, or duckduckgo)
+
+    Returns:
+        list: SearchBackend instances
+    """
+    if names is None:
+        names = os.getenv("SEARCH_BACKENDS", "duckduckgo").split(",")
+    backends = [get_backend(name.strip().lower()) for name in names if name.strip()]
+    return [backend for backend in backends if backend.available()]
+
+
+def merge_results(ranked_lists, max_results):
+    """
+    Merge result lists from several engines with reciprocal rank fusion.
+
+    Args:
+        ranked_lists (list): One list of result dicts per backend
+        max_results (int): Maximum number of merged results
+
+    Returns:
+        list: Unique results, best first
+    """
+    scores = {}
+    merged = {}
+    for results in ranked_lists:
+        for rank, result in enumerate(results):
+            key = canonicalize_url(result.get('href', ''))
+            scores[key] = scores.get(key, 0.0) + 1.0 / (RRF_K + rank + 1)
+            merged.setdefault(key, result)
+
+    ordered = sorted(merged, key=lambda key: scores[key], reverse=True)
+    return [merged[key] for key in ordered[:max_results]]
+
+
+def _unique_count(ranked_lists):
+    return len({canonicalize_url(r.get('href', '')) for results in ranked_lists for r in results})
+
+
+def run_search(query, max_results, backends=None, mode=None):
+    """
+    Query the configured search backends.
+
+    Args:
+        query (str): The search query
+        max_results (int): Number of results wanted
+        backends (list): SearchBackend instances (default: get_backends())
+        mode (str): single, parallel or hedged (default: SEARCH_MODE)
+
+    Returns:
+        list: Result dicts with ``title``, ``href`` and ``body`` keys
+
+    Raises:
+        Exception: The last backend error if no backend returned results
+    """
+    if backends is None:
+        backends = get_backends()
+    if not backends:
+        raise RuntimeError("No search backend available. Check SEARCH_BACKENDS.")
+    if mode is None:
+        mode = os.getenv("SEARCH_MODE", "single").lower()
+
+    if mode == "single" or len(backends) == 1:
+        return backends[0].search(query, max_results)[:max_results]
+
+    timeout = float(os.getenv("SEARCH_TIMEOUT", 15.0))
+    hedge_delay = float(os.getenv("SEARCH_HEDGE_DELAY", 1.5))
+    deadline = time.monotonic() + timeout
+
+    pending = {_executor.submit(backends[0].search, query, max_results)}
+    waiting = list(backends[1:])
+    if mode != "hedged":
+        pending.update(_executor.submit(backend.search, query, max_results) for backend in waiting)
+        waiting = []
+
+    ranked_lists = []
+    last_error = None
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        # In hedged mode, wake up after the hedge delay to start the backups
+        wait_timeout = min(remaining, hedge_delay) if waiting else remaining
+        done, pending = wait(pending, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            try:
+                ranked_lists.append(future.result())
+            except Exception as e:
+                last_error = e
+
+        if _unique_count(ranked_lists) >= max_results:
+            # Enough unique results: don't wait for slower engines
+            break
+
+        if waiting and (not done or not pending):
+            # Primary is slow or failed: hedge with the remaining backends
+            pending.update(_executor.submit(backend.search, query, max_results) for backend in waiting)
+            waiting = []
+
+    if not ranked_lists and last_error is not None:
+        raise last_error
+    return merge_results(ranked_lists, max_results)
@@ -1,9 +1,15 @@
 """Search tool for finding information on the web."""
 
 from crewai.tools import tool
-from duckduckgo_search import DDGS
 import os
-import time
+
+from .dedup import canonicalize_url, get_deduplicator
+from .novelty import get_novelty_tracker
+from .prefetch import get_prefetcher
+from .search_backends import run_search
+from src.utils.cancellation import check_cancelled
+from src.utils.profiling import blocking_span
+from src.utils.singleflight import coalesce
 
 @tool("Web Search Tool")
 def search_tool(query: str) -> str:
@@ -16,26 +22,50 @@ def search_tool(query: str) -> str:
     Returns:
         str: Search results with titles, URLs, and snippets
     """
+    # A run stopped at its deadline or budget ends the agent's step here
+    check_cancelled()
+    
     try:
-        max_results = int(os.getenv("MAX_SEARCH_RESULTS", 3))
-        request_delay = float(os.getenv("REQUEST_DELAY", 2.0))
+        # No new searches once scraped pages stopped adding information
+        tracker = get_novelty_tracker()
+        if tracker is not None and tracker.refuse():
+            return tracker.stop_message
         
-        # Add delay to prevent rate limiting
-        time.sleep(request_delay)
+        max_results = int(os.getenv("MAX_SEARCH_RESULTS", 3))
         
-        # Use DuckDuckGo for web search
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=max_results))
+        # Query the configured search backends (DuckDuckGo by default);
+        # identical queries in flight at the same time share one request
+        key = "|".join([
+            os.getenv("SEARCH_BACKENDS", "duckduckgo"),
+            os.getenv("SEARCH_MODE", "single"),
+            str(max_results),
+            ' '.join(query.lower().split())
+        ])
+        with blocking_span("search"):
+            results = coalesce("search", key, lambda: run_search(query, max_results))
         
         if not results:
             return f"No results found for query: {query}"
         
+        # Drop mirrors and AMP variants of the same page
+        unique_results = {}
+        for result in results:
+            unique_results.setdefault(canonicalize_url(result.get('href', '')), result)
+        
+        # Start fetching the top hits while the agent decides what to scrape
+        prefetcher = get_prefetcher()
+        if prefetcher is not None:
+            prefetcher.prefetch([result.get('href', '') for result in unique_results.values()])
+        
         # Format results
+        deduplicator = get_deduplicator()
         formatted_results = []
-        for i, result in enumerate(results, 1):
+        for i, result in enumerate(unique_results.values(), 1):
+            url = result.get('href', 'N/A')
+            scraped = " (already scraped)" if deduplicator.seen_url(url, count=False) else ""
             formatted_results.append(
                 f"{i}. {result.get('title', 'N/A')}\n"
-                f"   URL: {result.get('href', 'N/A')}\n"
+                f"   URL: {url}{scraped}\n"
                 f"   {result.get('body', 'N/A')}\n"
             )
         
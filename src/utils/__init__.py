@@ -1,15 +1,41 @@
 # Utility package
-from .config import load_config, get_agent_config, get_task_config
+from .config import load_config, get_agent_config, get_task_config, get_memory_config
 from .helpers import save_report, format_timestamp, clean_text
 from .llm_factory import create_llm, get_available_providers
+from .report_store import ReportSink, ReportReader, open_report
+from .report_archive import ReportArchive, get_report_archive
+from .checkpoint import CheckpointStore, make_run_id, is_valid_run_id, purge_expired_checkpoints
+from .memory import LocalMemoryStorage, build_crew_memory
+from .singleflight import SingleFlight, LeaderAborted, coalesce
+from .profiling import RunProfiler, profile_run
+from .cancellation import StepCancelled, check_cancelled
 
 __all__ = [
     'load_config',
     'get_agent_config',
     'get_task_config',
+    'get_memory_config',
     'save_report',
     'format_timestamp',
     'clean_text',
     'create_llm',
-    'get_available_providers'
+    'get_available_providers',
+    'ReportSink',
+    'ReportReader',
+    'open_report',
+    'ReportArchive',
+    'get_report_archive',
+    'CheckpointStore',
+    'make_run_id',
+    'is_valid_run_id',
+    'purge_expired_checkpoints',
+    'LocalMemoryStorage',
+    'build_crew_memory',
+    'SingleFlight',
+    'LeaderAborted',
+    'coalesce',
+    'RunProfiler',
+    'profile_run',
+    'StepCancelled',
+    'check_cancelled'
 ]
@@ -0,0 +1,74 @@
+"""Cooperative cancellation and token accounting of a running research step.
+
+The run scheduler runs each step with a guard in a context variable. Code
+that is about to spend time or tokens on behalf of the step calls
+:func:`check_cancelled` first: the search and scraping tools before every
+fetch, LLM wrappers before every call. Once the run's deadline has passed or
+its token budget is spent, the check raises :class:`StepCancelled`, so an
+abandoned step stops at its next tool or LLM call instead of finishing in
+the background. LLM wrappers report the tokens of every call through
+:func:`charge_tokens`, which lets the budget stop a step part-way.
+
+Outside a scheduled step both functions only read a context variable.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class StepCancelled(BaseException):
+    """
+    Raised inside a step once its run is cancelled or its budget is spent.
+
+    Derives from BaseException so that crewai, which catches Exception to
+    retry a failed task, lets it through and the step really stops.
+    """
+
+
+_current_step = ContextVar('current_step', default=None)
+
+
+def current_step():
+    """Return the guard of the step running in this context, or None."""
+    return _current_step.get()
+
+
+@contextmanager
+def use_step(guard):
+    """
+    Run the code inside the block as part of a scheduled step.
+
+    Args:
+        guard: Object with ``check()`` and ``charge(tokens)`` methods
+            (see ``src.runs.scheduler.StepGuard``)
+    """
+    token = _current_step.set(guard)
+    try:
+        yield guard
+    finally:
+        _current_step.reset(token)
+
+
+def check_cancelled():
+    """
+    Stop the current step if its run was cancelled.
+
+    Raises:
+        StepCancelled: If the deadline has passed or the token budget is spent
+    """
+    guard = _current_step.get()
+    if guard is not None:
+        guard.check()
+
+
+def charge_tokens(prompt_tokens, completion_tokens=0):
+    """
+    Charge the tokens of an LLM call to the current step's budget.
+
+    Args:
+        prompt_tokens (int): Tokens sent to the model
+        completion_tokens (int): Tokens generated by the model
+    """
+    guard = _current_step.get()
+    if guard is not None:
+        guard.charge(int(prompt_tokens) + int(completion_tokens))
@@ -0,0 +1,195 @@
+"""Checkpoint store for resumable research runs.
+
+Each task output is written to ``outputs/checkpoints/<run_id>/`` as soon as
+the task completes. If a later task fails, the next run with the same run id
+loads the completed outputs and only executes the remaining tasks.
+Checkpoints untouched for ``CHECKPOINT_TTL_HOURS`` (default 24) expire.
+
+Run ids come from clients (a resume token), so only ids in the format
+:func:`make_run_id` generates are accepted as directory names.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+MANIFEST_FILENAME = "manifest.json"
+
+# Format of the ids make_run_id generates
+RUN_ID_PATTERN = re.compile(r'^[0-9a-f]{16}$')
+
+
+def _normalize(text):
+    return ' '.join(str(text).lower().split())
+
+
+def make_run_id(topic, research_depth="standard", owner=None):
+    """
+    Derive the run id of a research submission.
+
+    Submissions of the same owner (a browser session, an API client) on the
+    same topic and depth share a run id, so re-submitting resumes the run.
+    Without an owner every call returns a new id; pass that id back as a
+    resume token to continue the run.
+
+    Args:
+        topic (str): Research topic
+        research_depth (str): Depth of research (quick, standard, deep)
+        owner (str): Identity of the submitter (default: none, a new id)
+
+    Returns:
+        str: Run id
+    """
+    if owner is None:
+        owner = uuid.uuid4().hex
+    key = f"{owner}|{_normalize(topic)}|{research_depth.lower()}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def is_valid_run_id(run_id):
+    """Whether a run id has the format :func:`make_run_id` generates."""
+    return isinstance(run_id, str) and RUN_ID_PATTERN.match(run_id) is not None
+
+
+def _default_checkpoint_dir():
+    # Get the project root directory
+    current_dir = Path(__file__).parent.parent.parent
+    return current_dir / "outputs" / "checkpoints"
+
+
+def _ttl_seconds(ttl_hours=None):
+    if ttl_hours is None:
+        ttl_hours = float(os.getenv("CHECKPOINT_TTL_HOURS", 24))
+    return ttl_hours * 3600
+
+
+def _write_atomic(path, text):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class CheckpointStore:
+    """Persists completed task outputs of a single run."""
+
+    def __init__(self, run_id, checkpoint_dir=None):
+        """
+        Args:
+            run_id (str): Run id (see make_run_id)
+            checkpoint_dir (str): Base directory (default: outputs/checkpoints)
+
+        Raises:
+            ValueError: If the run id is not one make_run_id generates
+        """
+        if checkpoint_dir is None:
+            checkpoint_dir = _default_checkpoint_dir()
+        if not is_valid_run_id(run_id):
+            raise ValueError(f"Invalid run id: {run_id!r}")
+
+        base_dir = Path(checkpoint_dir).resolve()
+        self.run_id = run_id
+        self.run_dir = (base_dir / run_id).resolve()
+        if self.run_dir.parent != base_dir:
+            raise ValueError(f"Invalid run id: {run_id!r}")
+        self.manifest_path = self.run_dir / MANIFEST_FILENAME
+
+    def _read_manifest(self):
+        if not self.manifest_path.exists():
+            return {'run_id': self.run_id, 'tasks': []}
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self, task_key, output, **metadata):
+        """
+        Persist the output of a completed task.
+
+        Args:
+            task_key (str): Task key (research, analyze, write, review)
+            output (str): Task output
+            **metadata: Extra run metadata stored in the manifest (e.g. topic)
+        """
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self.run_dir / f"{task_key}.md", str(output))
+
+        # The manifest is written last so it never lists a missing output
+        manifest = self._read_manifest()
+        manifest.update(metadata)
+        manifest['tasks'] = [task for task in manifest['tasks'] if task['key'] != task_key]
+        manifest['tasks'].append({
+            'key': task_key,
+            'completed_at': datetime.now().isoformat(timespec='seconds')
+        })
+        _write_atomic(self.manifest_path, json.dumps(manifest, indent=2))
+
+    def expired(self, ttl_hours=None):
+        """Whether the checkpoint was last written more than the TTL ago."""
+        if not self.manifest_path.exists():
+            return False
+        return time.time() - self.manifest_path.stat().st_mtime > _ttl_seconds(ttl_hours)
+
+    def matches(self, topic, research_depth):
+        """Whether a checkpoint exists and belongs to this topic and depth."""
+        if not self.manifest_path.exists():
+            return False
+        manifest = self._read_manifest()
+        if 'topic' in manifest and _normalize(manifest['topic']) != _normalize(topic):
+            return False
+        return manifest.get('research_depth', research_depth).lower() == research_depth.lower()
+
+    def load(self):
+        """
+        Load the outputs of all completed tasks.
+
+        Expired checkpoints are removed instead of being resumed.
+
+        Returns:
+            dict: Task key to output, in completion order
+        """
+        if self.expired():
+            print(f"⚠ Checkpoint {self.run_id} expired, starting over")
+            self.clear()
+            return {}
+
+        completed = {}
+        for task in self._read_manifest()['tasks']:
+            output_path = self.run_dir / f"{task['key']}.md"
+            if output_path.exists():
+                completed[task['key']] = output_path.read_text(encoding='utf-8')
+        return completed
+
+    def clear(self):
+        """Remove the checkpoint once the run has finished."""
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+
+
+def purge_expired_checkpoints(checkpoint_dir=None, ttl_hours=None):
+    """
+    Remove checkpoints of runs that were abandoned longer than the TTL ago.
+
+    Args:
+        checkpoint_dir (str): Base directory (default: outputs/checkpoints)
+        ttl_hours (float): Age limit (default: CHECKPOINT_TTL_HOURS or 24)
+
+    Returns:
+        int: Number of checkpoints removed
+    """
+    checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir is not None else _default_checkpoint_dir()
+    if not checkpoint_dir.is_dir():
+        return 0
+
+    removed = 0
+    for run_dir in checkpoint_dir.iterdir():
+        if not run_dir.is_dir() or not is_valid_run_id(run_dir.name):
+            continue
+        store = CheckpointStore(run_dir.name, checkpoint_dir)
+        if store.expired(ttl_hours):
+            store.clear()
+            removed += 1
+    return removed
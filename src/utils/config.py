@@ -25,6 +25,7 @@ class Config:
         self.gemini_model_flash = os.getenv("GEMINI_MODEL_FLASH", "gemini-2.0-flash")
         self.gemini_model_pro = os.getenv("GEMINI_MODEL_PRO", "gemini-2.5-pro")
         self.groq_model = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")  # Fast and free
+        self.groq_fast_model = os.getenv("GROQ_FAST_MODEL", "llama-3.1-8b-instant")  # Page summaries
         self.openrouter_model = os.getenv("OPENROUTER_MODEL", "meta-llama/llama-3.1-8b-instruct:free")
         self.together_model = os.getenv("TOGETHER_MODEL", "meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo")
         
@@ -94,3 +95,15 @@ def get_task_config(config_path=None):
         config = yaml.safe_load(f)
     
     return config.get('tasks', {})
+
+def get_memory_config(config_path=None):
+    """Load agent memory settings from YAML file."""
+    if config_path is None:
+        # Get the project root directory
+        current_dir = Path(__file__).parent.parent.parent
+        config_path = current_dir / "config" / "agents_config.yaml"
+    
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    
+    return config.get('memory', {})
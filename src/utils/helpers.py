@@ -36,6 +36,10 @@ def save_report(content, topic, output_dir=None):
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(content)
     
+    # Register the report in the searchable archive
+    from .report_archive import get_report_archive, ARCHIVE_FILENAME
+    get_report_archive(output_dir / ARCHIVE_FILENAME).add_report(filepath, topic, content)
+    
     return str(filepath)
 
 def clean_filename(text):
@@ -7,7 +7,7 @@ from langchain_groq import ChatGroq
 from langchain_openai import ChatOpenAI
 
 
-def create_llm(config, temperature: float = 0.5):
+def create_llm(config, temperature: float = 0.5, fast: bool = False):
     """
     Create LLM instance using available providers in priority order.
     
@@ -16,6 +16,8 @@ def create_llm(config, temperature: float = 0.5):
     Args:
         config: Configuration object with API keys
         temperature: Model temperature
+        fast: Use the provider's small, fast model (for bulk work such as
+            summarizing scraped pages)
         
     Returns:
         LLM instance
@@ -31,9 +33,10 @@ def create_llm(config, temperature: float = 0.5):
     for prov in providers:
         try:
             if prov == 'groq' and config.groq_api_key:
-                print(f"✓ Using Groq ({config.groq_model}) - 14,400 free requests/day")
+                model = config.groq_fast_model if fast else config.groq_model
+                print(f"✓ Using Groq ({model}) - 14,400 free requests/day")
                 return ChatGroq(
-                    model=config.groq_model,
+                    model=model,
                     temperature=temperature,
                     groq_api_key=config.groq_api_key,
                     max_retries=config.max_retries
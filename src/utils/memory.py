@@ -0,0 +1,258 @@
+"""Lightweight local memory backend for the research agents.
+
+crewai's default memory stack embeds every memory item with an external
+embedding model and keeps on-disk vector stores, which costs an embedding
+round trip and disk writes on every agent step. Research runs are short, so
+:class:`LocalMemoryStorage` keeps a size-bounded, in-process store with
+keyword recall (no embeddings) and can optionally persist to SQLite.
+
+crewai's memory belongs to the crew, so the backend is chosen for all agents
+with ``memory.backend`` in ``agents_config.yaml``:
+
+- ``local`` (default): short-term and entity memory backed by
+  LocalMemoryStorage; crewai's general memory switch stays off so it never
+  creates long-term memory (an extra LLM evaluation of every task output)
+- ``crewai``: crewai's default embedding-based memory
+- ``none``: no memory
+"""
+
+import json
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime
+from pathlib import Path
+
+LOCAL = "local"
+CREWAI = "crewai"
+NONE = "none"
+
+STOP_WORDS = {
+    'the', 'and', 'for', 'are', 'was', 'were', 'been', 'being', 'with', 'that',
+    'this', 'from', 'have', 'has', 'had', 'not', 'but', 'its', 'into', 'than',
+    'then', 'them', 'they', 'their', 'there', 'what', 'which', 'when', 'will',
+    'would', 'could', 'should', 'about', 'also', 'more', 'most', 'such', 'can'
+}
+
+
+# BM25 term saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Query keywords an item must share to be recalled (fewer if the query has fewer)
+MIN_MATCHED_KEYWORDS = 2
+
+
+def get_memory_mode(memory_config=None):
+    """
+    Resolve the memory backend configured for the crew.
+
+    Args:
+        memory_config (dict): Memory settings from YAML
+
+    Returns:
+        str: local, crewai or none
+    """
+    mode = (memory_config or {}).get('backend', LOCAL)
+    if mode is True:
+        return LOCAL
+    if mode is False or mode is None:
+        return NONE
+    mode = str(mode).lower()
+    return mode if mode in (LOCAL, CREWAI, NONE) else LOCAL
+
+
+def _keywords(text):
+    words = re.findall(r'[a-z0-9]{3,}', str(text).lower())
+    return [word for word in words if word not in STOP_WORDS]
+
+
+class LocalMemoryStorage:
+    """
+    Size-bounded keyword memory implementing crewai's storage interface
+    (``save``, ``search`` and ``reset``).
+    """
+
+    def __init__(self, name, max_items=500, db_path=None):
+        """
+        Args:
+            name (str): Memory type stored (e.g. short_term, entities)
+            max_items (int): Items kept before the oldest are evicted
+            db_path (str): Optional SQLite file for persistence across runs
+        """
+        self.name = name
+        self.max_items = max_items
+        self.db_path = Path(db_path) if db_path else None
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+        self._index = {}
+        self._next_id = 0
+        self._total_length = 0
+
+        if self.db_path is not None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS memories ("
+                    "id INTEGER PRIMARY KEY, name TEXT NOT NULL, value TEXT NOT NULL, "
+                    "metadata TEXT, created_at TEXT NOT NULL)"
+                )
+                rows = conn.execute(
+                    "SELECT value, metadata FROM memories WHERE name = ? ORDER BY id DESC LIMIT ?",
+                    (name, max_items)
+                ).fetchall()
+            for value, metadata in reversed(rows):
+                self._add(value, json.loads(metadata or '{}'))
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _add(self, value, metadata):
+        item_id = self._next_id
+        self._next_id += 1
+        counts = Counter(_keywords(value))
+        length = sum(counts.values())
+        self._items[item_id] = (str(value), metadata, counts, length)
+        self._total_length += length
+        for keyword in counts:
+            self._index.setdefault(keyword, set()).add(item_id)
+
+        while len(self._items) > self.max_items:
+            old_id, (_, _, old_counts, old_length) = self._items.popitem(last=False)
+            self._total_length -= old_length
+            for keyword in old_counts:
+                ids = self._index.get(keyword)
+                if ids is not None:
+                    ids.discard(old_id)
+                    if not ids:
+                        del self._index[keyword]
+
+    def save(self, value, metadata=None):
+        """Store a memory item."""
+        metadata = dict(metadata or {})
+        with self._lock:
+            self._add(value, metadata)
+
+        if self.db_path is not None:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO memories (name, value, metadata, created_at) VALUES (?, ?, ?, ?)",
+                    (self.name, str(value), json.dumps(metadata, default=str),
+                     datetime.now().isoformat(timespec='seconds'))
+                )
+                # Keep the table bounded as well
+                conn.execute(
+                    "DELETE FROM memories WHERE name = ? AND id NOT IN "
+                    "(SELECT id FROM memories WHERE name = ? ORDER BY id DESC LIMIT ?)",
+                    (self.name, self.name, self.max_items)
+                )
+
+    def search(self, query, limit=3, score_threshold=0.35):
+        """
+        Recall the items that best match the query's keywords.
+
+        Items are ranked with BM25 over the query keywords found in the store,
+        so long queries (crewai passes whole task descriptions) still recall
+        the items matching their rarer terms. Scores are relative to the best
+        match, which makes ``score_threshold`` a rank cutoff.
+
+        Args:
+            query (str): Text to recall memories for
+            limit (int): Maximum number of items
+            score_threshold (float): Minimum score relative to the best match
+
+        Returns:
+            list: Dicts with ``context``, ``metadata`` and ``score`` keys
+        """
+        query_keywords = set(_keywords(query))
+
+        with self._lock:
+            present = [keyword for keyword in query_keywords if keyword in self._index]
+            if not present:
+                return []
+            total = len(self._items)
+            average_length = max(self._total_length / total, 1.0)
+            min_matched = min(MIN_MATCHED_KEYWORDS, len(present))
+
+            scores = {}
+            matched = Counter()
+            for keyword in present:
+                ids = self._index[keyword]
+                # Rare keywords count more than ones found in every item
+                idf = math.log(1 + (total - len(ids) + 0.5) / (len(ids) + 0.5))
+                for item_id in ids:
+                    _, _, counts, length = self._items[item_id]
+                    tf = counts[keyword]
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                    scores[item_id] = scores.get(item_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+                    matched[item_id] += 1
+
+            ranked = sorted(
+                (item for item in scores.items() if matched[item[0]] >= min_matched),
+                key=lambda item: item[1], reverse=True
+            )
+            results = []
+            for item_id, score in ranked[:limit]:
+                score = score / ranked[0][1]
+                if score < score_threshold:
+                    break
+                value, metadata, _, _ = self._items[item_id]
+                results.append({'context': value, 'memory': value, 'metadata': metadata, 'score': score})
+        return results
+
+    def reset(self):
+        """Forget every item."""
+        with self._lock:
+            self._items.clear()
+            self._index.clear()
+            self._total_length = 0
+        if self.db_path is not None:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM memories WHERE name = ?", (self.name,))
+
+
+def build_crew_memory(memory_config=None):
+    """
+    Build the memory keyword arguments for a Crew from the memory settings.
+
+    Args:
+        memory_config (dict): Memory settings from YAML (backend, max_items,
+            persist, path)
+
+    Returns:
+        dict: Keyword arguments to pass to ``Crew(...)``
+    """
+    mode = get_memory_mode(memory_config)
+    if mode == NONE:
+        return {'memory': False}
+    if mode == CREWAI:
+        return {'memory': True}
+
+    try:
+        from crewai.memory import ShortTermMemory, EntityMemory
+    except ImportError:
+        print("⚠️  Installed crewai has no ShortTermMemory/EntityMemory; running without memory")
+        return {'memory': False}
+
+    memory_config = memory_config or {}
+    max_items = int(memory_config.get('max_items', 500))
+    db_path = None
+    if memory_config.get('persist', False):
+        db_path = memory_config.get('path')
+        if db_path is None:
+            # Get the project root directory
+            current_dir = Path(__file__).parent.parent.parent
+            db_path = current_dir / "outputs" / "memory" / "memory.db"
+
+    # memory=False keeps crewai from adding its default long-term memory;
+    # the explicit short-term and entity memories are still used
+    return {
+        'memory': False,
+        'short_term_memory': ShortTermMemory(
+            storage=LocalMemoryStorage("short_term", max_items=max_items, db_path=db_path)),
+        'entity_memory': EntityMemory(
+            storage=LocalMemoryStorage("entities", max_items=max_items, db_path=db_path))
+    }
+
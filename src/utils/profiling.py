@@ -0,0 +1,324 @@
+"""On-demand profiling of a single research run.
+
+When profiling is switched on for a run, three things are captured until
+the run ends:
+
+- a sampling CPU profile: a background thread records the Python stacks of
+  the run's threads every ``PROFILE_INTERVAL`` seconds. Samples whose
+  innermost frame sits in socket, SSL or lock/queue code are tagged as
+  waits, so the same profile shows where time goes on CPU and where it is
+  spent blocked
+- ``tracemalloc`` statistics: peak traced memory and the top allocation
+  sites, also as stacks
+- wall-clock spans around known blocking operations (searches, scrapes,
+  waits on coalesced or prefetched work, retry backoff)
+
+The stacks are written in the folded format (``frame;frame;frame count``)
+read by flamegraph.pl, speedscope and inferno, next to the run's report:
+
+- ``<report>.cpu.folded``: CPU and wait samples
+- ``<report>.alloc.folded``: live allocations in bytes per stack
+- ``<report>.profile.json``: wait breakdown, spans and top allocations
+
+Runs executing concurrently in the same process share the worker pools, so
+their samples and allocations appear in each other's profiles. Profile a
+slow run on its own where possible. ``tracemalloc`` is process-wide as well:
+it is started by the first profiled run and stopped by the last one.
+
+When profiling is off nothing is started; :func:`blocking_span` only reads a
+context variable.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+# Threads belonging to research runs (run pool, prefetch, hedge, search and summary pools)
+PROFILED_THREAD_PREFIXES = ('research', 'prefetch', 'hedge', 'search', 'summary')
+
+# Innermost frames that mean the thread is blocked rather than on CPU
+WAIT_FRAMES = {
+    ('socket.py', None): 'network',
+    ('ssl.py', None): 'network',
+    ('selectors.py', None): 'network',
+    ('connection.py', 'create_connection'): 'network',
+    ('threading.py', 'wait'): 'lock',
+    ('threading.py', 'join'): 'lock',
+    ('threading.py', '_wait_for_tstate_lock'): 'lock',
+    ('queue.py', 'get'): 'lock',
+    ('_base.py', 'result'): 'lock',
+    ('_base.py', 'wait'): 'lock',
+}
+
+# Allocation sites listed in the summary
+TOP_ALLOCATIONS = 25
+
+# Profiled runs using tracemalloc, and whether the profiler started it
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+
+
+def _acquire_tracemalloc():
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(int(os.getenv("PROFILE_TRACE_DEPTH", 16)))
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+
+
+def _release_tracemalloc():
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        # Tracing started outside the profiler (e.g. PYTHONTRACEMALLOC) is left on
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+
+_current_profiler = ContextVar('current_profiler', default=None)
+
+
+def profiling_requested():
+    """Check whether profiling is switched on for every run (RESEARCH_PROFILE)."""
+    return os.getenv("RESEARCH_PROFILE", "false").lower() == "true"
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})"
+
+
+def _wait_category(frame):
+    filename = Path(frame.f_code.co_filename).name
+    return (WAIT_FRAMES.get((filename, frame.f_code.co_name))
+            or WAIT_FRAMES.get((filename, None)))
+
+
+def _is_idle_worker(frame):
+    # Pool threads waiting for work sit in ThreadPoolExecutor's _worker loop
+    code = frame.f_code
+    return code.co_name == '_worker' and code.co_filename.endswith(os.path.join('futures', 'thread.py'))
+
+
+class RunProfiler:
+    """Sampling CPU profiler, allocation tracker and wait timer for one run."""
+
+    def __init__(self, name, output_dir, interval=None):
+        """
+        Args:
+            name (str): File stem of the profile outputs (the report's stem)
+            output_dir (str): Directory to write the profile to
+            interval (float): Seconds between stack samples
+                (default: PROFILE_INTERVAL or 0.005)
+        """
+        self.name = name
+        self.output_dir = Path(output_dir)
+        self.interval = interval if interval is not None else float(os.getenv("PROFILE_INTERVAL", 0.005))
+        self.owner = threading.current_thread()
+        self.samples = Counter()
+        self.categories = Counter()
+        self.spans = {}
+        self.sample_count = 0
+        self.sampling_seconds = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._tracing = False
+        self._started = None
+        self.wall_seconds = None
+        self._snapshot = None
+        self._peak_memory = None
+        self.paths = []
+
+    def start(self):
+        """Start sampling and allocation tracing."""
+        self._started = time.monotonic()
+        _acquire_tracemalloc()
+        self._tracing = True
+        self._sampler = threading.Thread(target=self._sample_loop, name="profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        """Stop sampling and take the allocation snapshot."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.wall_seconds = time.monotonic() - self._started
+        if not self._tracing:
+            return
+        try:
+            # Still tracing: this run holds a reference until it releases it
+            self._snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ])
+            self._peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            self._tracing = False
+            _release_tracemalloc()
+
+    def _profiled_threads(self):
+        return {
+            thread.ident: thread.name for thread in threading.enumerate()
+            if thread is self.owner or thread.name.startswith(PROFILED_THREAD_PREFIXES)
+        }
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            started = time.perf_counter()
+            threads = self._profiled_threads()
+            for ident, frame in sys._current_frames().items():
+                name = threads.get(ident)
+                if name is None or _is_idle_worker(frame):
+                    continue
+
+                category = _wait_category(frame) or 'cpu'
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(name)
+                stack.reverse()
+                if category != 'cpu':
+                    stack.append(f"[wait:{category}]")
+
+                self.samples[';'.join(stack)] += 1
+                self.categories[category] += 1
+            self.sample_count += 1
+            self.sampling_seconds += time.perf_counter() - started
+
+    def record_span(self, kind, seconds):
+        with self._lock:
+            span = self.spans.setdefault(kind, {'count': 0, 'seconds': 0.0})
+            span['count'] += 1
+            span['seconds'] += seconds
+
+    def summary(self):
+        """Wait breakdown, spans and top allocations."""
+        top = self._snapshot.statistics('lineno')[:TOP_ALLOCATIONS] if self._snapshot else []
+        # Actual time between samples, including the sampler's own work
+        period = (self.wall_seconds or 0.0) / self.sample_count if self.sample_count else self.interval
+        return {
+            'name': self.name,
+            'wall_seconds': round(self.wall_seconds or 0.0, 3),
+            'sample_interval': self.interval,
+            'samples': self.sample_count,
+            'sampler_overhead_seconds': round(self.sampling_seconds, 3),
+            # Thread-seconds per category, estimated from the sample counts
+            'thread_seconds': {
+                category: round(count * period, 3)
+                for category, count in self.categories.most_common()
+            },
+            'blocking_spans': {
+                kind: {'count': span['count'], 'seconds': round(span['seconds'], 3)}
+                for kind, span in sorted(self.spans.items(), key=lambda item: -item[1]['seconds'])
+            },
+            'peak_traced_bytes': self._peak_memory,
+            'top_allocations': [
+                {'site': str(stat.traceback[0]), 'bytes': stat.size, 'count': stat.count}
+                for stat in top
+            ]
+        }
+
+    def write(self):
+        """
+        Write the folded stacks and the summary next to the report.
+
+        Returns:
+            list: Paths of the written files
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        cpu_path = self.output_dir / f"{self.name}.cpu.folded"
+        alloc_path = self.output_dir / f"{self.name}.alloc.folded"
+        summary_path = self.output_dir / f"{self.name}.profile.json"
+
+        with open(cpu_path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+        with open(alloc_path, 'w', encoding='utf-8') as f:
+            if self._snapshot is not None:
+                for stat in self._snapshot.statistics('traceback'):
+                    frames = ';'.join(
+                        f"{Path(frame.filename).name}:{frame.lineno}" for frame in stat.traceback
+                    )
+                    f.write(f"{frames} {stat.size}\n")
+
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+
+        self.paths = [str(cpu_path), str(alloc_path), str(summary_path)]
+        return self.paths
+
+
+@contextmanager
+def profile_run(name, output_dir, enabled=None):
+    """
+    Profile the code inside the block if profiling is switched on.
+
+    Args:
+        name (str): File stem of the profile outputs
+        output_dir (str): Directory to write the profile to
+        enabled (bool): Switch for this run (default: RESEARCH_PROFILE)
+
+    Yields:
+        RunProfiler: The active profiler, or None when profiling is off or
+            could not be started
+    """
+    if enabled is None:
+        enabled = profiling_requested()
+    if not enabled:
+        yield None
+        return
+
+    # A profiler failure never fails the run it profiles
+    profiler = RunProfiler(name, output_dir)
+    try:
+        profiler.start()
+    except Exception as e:
+        print(f"⚠️ Profiling disabled for this run: {str(e)}")
+        profiler.stop()
+        profiler = None
+    if profiler is None:
+        yield None
+        return
+
+    token = _current_profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _current_profiler.reset(token)
+        try:
+            profiler.stop()
+            profiler.write()
+            print(f"📊 Profile written to {profiler.paths[0]}")
+        except Exception as e:
+            print(f"⚠️ Could not write the profile: {str(e)}")
+
+
+@contextmanager
+def blocking_span(kind):
+    """
+    Time a blocking operation for the profile of the current run.
+
+    Args:
+        kind (str): Category of the wait (e.g. search, scrape, backoff)
+    """
+    profiler = _current_profiler.get()
+    if profiler is None:
+        yield
+        return
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        profiler.record_span(kind, time.monotonic() - started)
@@ -0,0 +1,350 @@
+"""Searchable archive of generated research reports.
+
+Every finished report is registered in a SQLite database next to the reports
+(``outputs/reports/archive.db``). Report metadata, the extracted summary and
+the cited sources live in regular tables, while the full text is indexed in a
+contentless FTS5 table so the index stays small and searches stay fast even
+with a very large number of reports. The report bodies themselves remain in
+their report files and are only opened when a report is viewed.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from .helpers import extract_section, count_words
+from .report_store import get_reports_dir, open_report, REPORT_SUFFIX
+
+ARCHIVE_FILENAME = "archive.db"
+
+# Sections pulled out of every report with extract_section
+ARCHIVED_SECTIONS = ["Executive Summary", "Introduction", "Conclusion"]
+
+URL_PATTERN = re.compile(r'https?://[^\s<>\]\)"\']+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    topic TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    summary TEXT,
+    word_count INTEGER,
+    source_count INTEGER,
+    metrics TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_reports_created ON reports (created_at DESC, id DESC);
+CREATE TABLE IF NOT EXISTS sources (
+    report_id INTEGER NOT NULL REFERENCES reports (id) ON DELETE CASCADE,
+    url TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sources_report ON sources (report_id);
+CREATE INDEX IF NOT EXISTS idx_sources_url ON sources (url);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5 (
+    topic, sections, body, content=''
+);
+"""
+
+REPORT_COLUMNS = "r.id, r.path, r.topic, r.created_at, r.summary, r.word_count, r.source_count, r.metrics"
+
+
+def extract_sources(text):
+    """
+    Extract the unique URLs cited in a report.
+
+    Args:
+        text (str): Report content in markdown format
+
+    Returns:
+        list: URLs in order of first appearance
+    """
+    seen = {}
+    for url in URL_PATTERN.findall(text):
+        seen.setdefault(url.rstrip('.,;:'), None)
+    return list(seen)
+
+
+def _fts_query(query):
+    """Quote every term so user input can never be parsed as FTS5 syntax."""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return " ".join(f'"{term}"' for term in terms if term)
+
+
+def _read_stored(path):
+    """Return ``(topic, content, created_at)`` of a stored report; topic and date may be None."""
+    path = Path(path)
+    if path.name.endswith(REPORT_SUFFIX):
+        reader = open_report(path)
+        content = "\n\n".join(text for _, text in reader.iter_sections())
+        return reader.topic, content, reader.index.get('created_at')
+    return None, path.read_text(encoding='utf-8'), None
+
+
+def _row_to_dict(row):
+    report = dict(row)
+    report['metrics'] = json.loads(report['metrics'] or '{}')
+    return report
+
+
+class ReportArchive:
+    """SQLite-backed index of stored reports with full-text search."""
+
+    def __init__(self, db_path=None):
+        """
+        Open (and create if needed) the archive database.
+
+        Args:
+            db_path (str): Database path (default: outputs/reports/archive.db)
+        """
+        if db_path is None:
+            db_path = get_reports_dir() / ARCHIVE_FILENAME
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            try:
+                conn.executescript(FTS_SCHEMA)
+                self.fts_enabled = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: fall back to LIKE over topic/summary
+                print("⚠ SQLite FTS5 not available, report search limited to topics and summaries")
+                self.fts_enabled = False
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection so the archive can be shared across threads."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def add_report(self, path, topic, content, created_at=None, metrics=None):
+        """
+        Index a report. Reports already archived under the same path are skipped.
+
+        Args:
+            path (str): Path to the stored report file
+            topic (str): Research topic
+            content (str): Full report content in markdown format
+            created_at (str): ISO timestamp (default: now)
+            metrics (dict): Extra run metrics to store with the report
+
+        Returns:
+            int: Archive id of the report
+        """
+        path = str(path)
+        if created_at is None:
+            created_at = datetime.now().isoformat(timespec='seconds')
+
+        sections = {title: extract_section(content, title) for title in ARCHIVED_SECTIONS}
+        summary = sections["Executive Summary"] or sections["Introduction"]
+        sources = extract_sources(content)
+        word_count = count_words(content)
+
+        metrics = dict(metrics or {})
+        metrics.setdefault('word_count', word_count)
+        metrics.setdefault('source_count', len(sources))
+
+        with self._connect() as conn:
+            existing = conn.execute("SELECT id FROM reports WHERE path = ?", (path,)).fetchone()
+            if existing is not None:
+                # Report files are immutable once complete; indexing is idempotent
+                return existing['id']
+
+            cursor = conn.execute(
+                "INSERT INTO reports (path, topic, created_at, summary, word_count, source_count, metrics) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path, topic, created_at, summary, word_count, len(sources), json.dumps(metrics))
+            )
+            report_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO sources (report_id, url) VALUES (?, ?)",
+                [(report_id, url) for url in sources]
+            )
+            if self.fts_enabled:
+                conn.execute(
+                    "INSERT INTO reports_fts (rowid, topic, sections, body) VALUES (?, ?, ?, ?)",
+                    (report_id, topic, "\n\n".join(sections.values()), content)
+                )
+
+        return report_id
+
+    def add_stored_report(self, path, metrics=None):
+        """
+        Index a report written by :class:`ReportSink` or ``save_report``.
+
+        Args:
+            path (str): Path to a ``.mdz`` or ``.md`` report file
+            metrics (dict): Extra run metrics to store with the report
+
+        Returns:
+            int: Archive id of the report
+        """
+        path = Path(path)
+        topic, content, created_at = _read_stored(path)
+        if topic is not None:
+            return self.add_report(path, topic, content, created_at=created_at, metrics=metrics)
+
+        # save_report names files <topic>_<YYYYmmdd>_<HHMMSS>.md
+        match = re.match(r'(.*)_(\d{8}_\d{6})$', path.stem)
+        if match:
+            topic = match.group(1).replace('_', ' ')
+            created_at = datetime.strptime(match.group(2), "%Y%m%d_%H%M%S").isoformat()
+        else:
+            topic = path.stem.replace('_', ' ')
+            created_at = datetime.fromtimestamp(path.stat().st_mtime).isoformat(timespec='seconds')
+        return self.add_report(path, topic, content, created_at=created_at, metrics=metrics)
+
+    def import_directory(self, directory=None):
+        """
+        Index every report in a directory that is not archived yet.
+
+        Args:
+            directory (str): Reports directory (default: outputs/reports)
+
+        Returns:
+            int: Number of newly indexed reports
+        """
+        directory = get_reports_dir(directory)
+        with self._connect() as conn:
+            known = {row['path'] for row in conn.execute("SELECT path FROM reports")}
+
+        paths = sorted(directory.iterdir())
+        stored = {path.name[:-len(REPORT_SUFFIX)] for path in paths if path.name.endswith(REPORT_SUFFIX)}
+
+        imported = 0
+        for path in paths:
+            if not (path.name.endswith(REPORT_SUFFIX) or path.suffix == '.md'):
+                continue
+            if str(path) in known:
+                continue
+            if path.suffix == '.md' and path.stem in stored:
+                # Markdown export of a stored report, which is indexed itself
+                continue
+            try:
+                self.add_stored_report(path)
+            except FileNotFoundError:
+                # A run that never finished leaves a report without an index
+                print(f"⚠ Skipping unfinished report: {path.name}")
+                continue
+            imported += 1
+        return imported
+
+    def get(self, report_id):
+        """Return a single archived report as a dict, or None."""
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {REPORT_COLUMNS} FROM reports r WHERE r.id = ?",
+                               (report_id,)).fetchone()
+            if row is None:
+                return None
+            report = _row_to_dict(row)
+            report['sources'] = [r['url'] for r in conn.execute(
+                "SELECT url FROM sources WHERE report_id = ?", (report_id,))]
+        return report
+
+    def read_content(self, report_id):
+        """Full markdown of an archived report, or None if it is unknown or its file is gone."""
+        report = self.get(report_id)
+        if report is None or not Path(report['path']).exists():
+            return None
+        return _read_stored(report['path'])[1]
+
+    def list_reports(self, limit=20, offset=0):
+        """
+        List archived reports, newest first.
+
+        Args:
+            limit (int): Page size
+            offset (int): Number of reports to skip
+
+        Returns:
+            list: Report dicts
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {REPORT_COLUMNS} FROM reports r "
+                "ORDER BY r.created_at DESC, r.id DESC LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+        return [_row_to_dict(row) for row in rows]
+
+    def search(self, query, limit=20, offset=0):
+        """
+        Full-text search over topics, sections and report bodies.
+
+        Args:
+            query (str): Search terms (all terms must match)
+            limit (int): Page size
+            offset (int): Number of results to skip
+
+        Returns:
+            list: Report dicts ordered by relevance
+        """
+        match = _fts_query(query)
+        if not match:
+            return self.list_reports(limit, offset)
+
+        with self._connect() as conn:
+            if self.fts_enabled:
+                rows = conn.execute(
+                    f"SELECT {REPORT_COLUMNS} FROM reports_fts f "
+                    "JOIN reports r ON r.id = f.rowid "
+                    "WHERE reports_fts MATCH ? ORDER BY bm25(reports_fts, 10.0, 3.0, 1.0) "
+                    "LIMIT ? OFFSET ?",
+                    (match, limit, offset)
+                ).fetchall()
+            else:
+                pattern = f"%{query.strip()}%"
+                rows = conn.execute(
+                    f"SELECT {REPORT_COLUMNS} FROM reports r "
+                    "WHERE r.topic LIKE ? OR r.summary LIKE ? "
+                    "ORDER BY r.created_at DESC, r.id DESC LIMIT ? OFFSET ?",
+                    (pattern, pattern, limit, offset)
+                ).fetchall()
+        return [_row_to_dict(row) for row in rows]
+
+    def count(self, query=None):
+        """Number of archived reports, optionally restricted to a search query."""
+        match = _fts_query(query or "")
+        with self._connect() as conn:
+            if not match:
+                return conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+            if self.fts_enabled:
+                return conn.execute("SELECT COUNT(*) FROM reports_fts WHERE reports_fts MATCH ?",
+                                    (match,)).fetchone()[0]
+            pattern = f"%{query.strip()}%"
+            return conn.execute("SELECT COUNT(*) FROM reports WHERE topic LIKE ? OR summary LIKE ?",
+                                (pattern, pattern)).fetchone()[0]
+
+
+_archives = {}
+_archive_lock = threading.Lock()
+
+
+def get_report_archive(db_path=None):
+    """
+    Return the shared archive for a database, opening it on first use.
+
+    Args:
+        db_path (str): Database path (default: outputs/reports/archive.db)
+    """
+    if db_path is None:
+        db_path = get_reports_dir() / ARCHIVE_FILENAME
+    key = str(Path(db_path).resolve())
+    with _archive_lock:
+        if key not in _archives:
+            _archives[key] = ReportArchive(db_path)
+        return _archives[key]
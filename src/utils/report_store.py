@@ -0,0 +1,226 @@
+"""Incremental on-disk report storage for the multi-agent research system.
+
+Reports are written section by section as the agents produce them instead of
+being held as one large string. Each report is stored as two files:
+
+- ``<name>.mdz``: every section appended as its own gzip member, so the whole
+  file is still a valid gzip stream of the full markdown report
+- ``<name>.idx.json``: the index with the topic, timestamps and the byte
+  offset/length of every section inside the ``.mdz`` file, written once when
+  the report is closed
+
+Readers only load the index up front and decompress a section when it is
+actually rendered.
+"""
+
+import gzip
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from .helpers import clean_filename
+
+REPORT_SUFFIX = ".mdz"
+INDEX_SUFFIX = ".idx.json"
+
+
+def get_reports_dir(output_dir=None):
+    """
+    Resolve the directory reports are stored in.
+
+    Args:
+        output_dir (str): Directory override (default: outputs/reports)
+
+    Returns:
+        Path: Reports directory (created if missing)
+    """
+    if output_dir is None:
+        # Get the project root directory
+        current_dir = Path(__file__).parent.parent.parent
+        output_dir = current_dir / "outputs" / "reports"
+    else:
+        output_dir = Path(output_dir)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return output_dir
+
+
+def _index_path(report_path):
+    """Return the index path belonging to a ``.mdz`` report path."""
+    report_path = Path(report_path)
+    return report_path.with_name(report_path.name[:-len(REPORT_SUFFIX)] + INDEX_SUFFIX)
+
+
+def _write_index(index_path, index):
+    """Atomically replace the index file so readers never see a partial write."""
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp_path, index_path)
+
+
+class ReportSink:
+    """Append-only writer that persists report sections as they are generated."""
+
+    def __init__(self, topic, output_dir=None, name=None):
+        """
+        Create a new report on disk.
+
+        Args:
+            topic (str): Research topic (used for the filename)
+            output_dir (str): Directory to save report (default: outputs/reports)
+            name (str): Explicit file stem (default: cleaned topic + timestamp)
+        """
+        output_dir = get_reports_dir(output_dir)
+        if name is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            name = f"{clean_filename(topic)}_{timestamp}"
+
+        self.topic = topic
+        self.path = output_dir / f"{name}{REPORT_SUFFIX}"
+        self.index_path = _index_path(self.path)
+        self._lock = threading.Lock()
+        self._index = {
+            'topic': topic,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'completed': False,
+            'sections': []
+        }
+
+        # Truncate any previous report with the same name
+        self.path.write_bytes(b"")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # A failed run resumes into a new report, so this one is dropped
+            self.discard()
+
+    @property
+    def section_count(self):
+        """Number of sections written so far."""
+        return len(self._index['sections'])
+
+    def write_section(self, title, content):
+        """
+        Compress and append a section.
+
+        Args:
+            title (str): Section title shown in the report view
+            content (str): Section content in markdown format
+        """
+        raw = str(content).encode('utf-8')
+        if self._index['sections']:
+            # Keep the concatenated stream a readable markdown document
+            raw = b"\n\n" + raw
+        member = gzip.compress(raw)
+
+        with self._lock:
+            with open(self.path, 'ab') as f:
+                offset = f.tell()
+                f.write(member)
+            self._index['sections'].append({
+                'title': title,
+                'offset': offset,
+                'length': len(member),
+                'size': len(raw)
+            })
+
+    def close(self):
+        """Mark the report as complete and write its index."""
+        with self._lock:
+            self._index['completed'] = True
+            self._index['completed_at'] = datetime.now().isoformat(timespec='seconds')
+            _write_index(self.index_path, self._index)
+
+    def discard(self):
+        """Delete the report files of a run that did not finish."""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+            self.index_path.unlink(missing_ok=True)
+
+
+class ReportReader:
+    """Lazy reader for reports written by :class:`ReportSink`."""
+
+    def __init__(self, path):
+        """
+        Open a report by its ``.mdz`` path. Only the index is loaded.
+
+        Args:
+            path (str): Path to the ``.mdz`` report file
+        """
+        self.path = Path(path)
+        self.index_path = _index_path(self.path)
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            self.index = json.load(f)
+
+    @property
+    def topic(self):
+        return self.index.get('topic', '')
+
+    @property
+    def titles(self):
+        """List of section titles in the order they were written."""
+        return [section['title'] for section in self.index['sections']]
+
+    def __len__(self):
+        return len(self.index['sections'])
+
+    def read_section(self, position):
+        """
+        Decompress a single section.
+
+        Args:
+            position (int): Section position (negative values count from the end)
+
+        Returns:
+            str: Section content in markdown format
+        """
+        section = self.index['sections'][position]
+        with open(self.path, 'rb') as f:
+            f.seek(section['offset'])
+            member = f.read(section['length'])
+        return gzip.decompress(member).decode('utf-8').lstrip("\n")
+
+    def iter_sections(self):
+        """Yield ``(title, content)`` pairs one section at a time."""
+        for position, title in enumerate(self.titles):
+            yield title, self.read_section(position)
+
+    def export_markdown(self, output_dir=None):
+        """
+        Stream the report into a plain markdown file.
+
+        The export shares the report's file stem, so the archive can tell it
+        apart from reports that only exist as markdown.
+
+        Args:
+            output_dir (str): Directory to save report (default: next to the report)
+
+        Returns:
+            str: Path to saved file
+        """
+        output_dir = self.path.parent if output_dir is None else get_reports_dir(output_dir)
+        filepath = output_dir / (self.path.name[:-len(REPORT_SUFFIX)] + ".md")
+
+        # Decompress the member stream chunk by chunk instead of all at once
+        with gzip.open(self.path, 'rb') as src, open(filepath, 'wb') as dst:
+            while True:
+                chunk = src.read(64 * 1024)
+                if not chunk:
+                    break
+                dst.write(chunk)
+
+        return str(filepath)
+
+
+def open_report(path):
+    """Open a stored report for lazy reading."""
+    return ReportReader(path)
@@ -0,0 +1,227 @@
+"""Single-flight request coalescing for searches, scrapes and LLM calls.
+
+When several callers ask for the same key at the same time, only one of them
+(the leader) does the work; the others wait and receive the same result.
+This complements caching by fixing the thundering herd on cold keys.
+
+Coalescing works across threads in a process and, where ``fcntl`` file
+locks are available, across worker processes on the same machine: the
+leading process holds an exclusive lock on ``<key>.lock`` while it works and
+publishes the result to ``<key>.json``, where waiting processes pick it up.
+Results shared across processes must be JSON serializable.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from .profiling import blocking_span
+
+try:
+    import fcntl
+except ImportError:  # Windows: coalesce within the process only
+    fcntl = None
+
+# Seconds a published result stays valid for processes that waited on it
+DEFAULT_RESULT_TTL = 30.0
+
+# Remove stale lock/result files after this many published results
+PRUNE_EVERY = 100
+
+
+class LeaderAborted(RuntimeError):
+    """
+    Raised in waiting callers when the leader stopped without a result.
+
+    The leader may have been cancelled (``StepCancelled``) or interrupted.
+    That concerns the leader's own step only, so followers get this ordinary
+    error, chained to the original, instead of being cancelled themselves.
+    """
+
+
+class _Call:
+    """An in-flight call that followers wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one execution."""
+
+    def __init__(self, name, shared_dir=None, result_ttl=DEFAULT_RESULT_TTL):
+        """
+        Args:
+            name (str): Namespace for keys (e.g. search, scrape, llm)
+            shared_dir (str): Directory for cross-process locks and results
+                (None coalesces within this process only)
+            result_ttl (float): Seconds a published result stays valid
+        """
+        self.name = name
+        self.result_ttl = result_ttl
+        self.shared_dir = None
+        if shared_dir is not None and fcntl is not None:
+            self.shared_dir = Path(shared_dir) / name
+            self.shared_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._published = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """
+        Run ``fn()`` once for all concurrent callers with the same key.
+
+        Args:
+            key (str): Identity of the request
+            fn (callable): Zero-argument function doing the actual work
+
+        Returns:
+            The result of ``fn()``, shared by every caller
+
+        Raises:
+            Exception: The leader's error is re-raised in every waiting thread
+            LeaderAborted: In waiting threads, if the leader was cancelled or
+                interrupted (raised a BaseException)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            with blocking_span("coalesce_wait"):
+                call.event.wait()
+            if isinstance(call.error, Exception):
+                raise call.error
+            if call.error is not None:
+                raise LeaderAborted(
+                    f"{self.name} call for {key!r} was abandoned by its leader") from call.error
+            return call.result
+
+        try:
+            call.result = self._do_shared(key, fn)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def _do_shared(self, key, fn):
+        """Coalesce with other processes through a lock file, if enabled."""
+        if self.shared_dir is None:
+            self.executions += 1
+            return fn()
+
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        lock_path = self.shared_dir / f"{digest}.lock"
+        result_path = self.shared_dir / f"{digest}.json"
+
+        with open(lock_path, 'a+') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # Another process is the leader: wait for it and take its result
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                found, result = self._read_result(result_path, key)
+                if found:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    self.coalesced += 1
+                    return result
+            try:
+                # Leader (or the previous leader failed): do the work ourselves
+                self.executions += 1
+                result = fn()
+                self._write_result(result_path, key, result)
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_result(self, result_path, key):
+        try:
+            if time.time() - result_path.stat().st_mtime > self.result_ttl:
+                return False, None
+            with open(result_path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return False, None
+        if payload.get('key') != key:
+            return False, None
+        return True, payload['result']
+
+    def _write_result(self, result_path, key, result):
+        try:
+            payload = json.dumps({'key': key, 'result': result})
+        except (TypeError, ValueError):
+            # Not shareable across processes; threads still got the result
+            return
+        tmp_path = result_path.with_name(f"{result_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, result_path)
+
+        self._published += 1
+        if self._published % PRUNE_EVERY == 0:
+            self._prune()
+
+    def _prune(self):
+        cutoff = time.time() - self.result_ttl * 10
+        for path in self.shared_dir.iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def _default_shared_dir():
+    if os.getenv("SINGLEFLIGHT_SHARED", "true").lower() != "true":
+        return None
+    shared_dir = os.getenv("SINGLEFLIGHT_DIR")
+    if shared_dir:
+        return shared_dir
+    # Get the project root directory
+    current_dir = Path(__file__).parent.parent.parent
+    return current_dir / "outputs" / "singleflight"
+
+
+def get_flight(name):
+    """Return the shared SingleFlight group for a namespace."""
+    with _flights_lock:
+        if name not in _flights:
+            _flights[name] = SingleFlight(name, shared_dir=_default_shared_dir())
+        return _flights[name]
+
+
+def coalesce(name, key, fn):
+    """
+    Run ``fn()`` once for all concurrent callers of ``(name, key)``.
+
+    Args:
+        name (str): Namespace (search, scrape, llm)
+        key (str): Identity of the request within the namespace
+        fn (callable): Zero-argument function doing the actual work
+
+    Returns:
+        The shared result of ``fn()``
+    """
+    return get_flight(name).do(key, fn)
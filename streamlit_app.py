@@ -5,8 +5,8 @@ A Streamlit web interface for the multi-agent research system.
 
 import streamlit as st
 import os
-from datetime import datetime
-from crewai import Crew, Process
+import time
+import uuid
 from pathlib import Path
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_community.llms import HuggingFaceHub
@@ -15,15 +15,10 @@ from langchain_community.llms import HuggingFaceHub
 import sys
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from src.agents import (
-    create_researcher_agent,
-    create_analyzer_agent,
-    create_writer_agent,
-    create_critic_agent
-)
-from src.tasks import create_research_tasks
-from src.utils import load_config, get_agent_config, get_task_config, save_report
-from src.utils.llm_factory import create_llm, get_available_providers
+from src.runs import get_run_manager
+from src.tasks import TASK_AGENTS
+from src.utils import load_config, open_report, get_report_archive
+from src.utils.llm_factory import get_available_providers
 
 # Page configuration
 st.set_page_config(
@@ -73,10 +68,18 @@ def initialize_session_state():
     """Initialize session state variables."""
     if 'research_completed' not in st.session_state:
         st.session_state.research_completed = False
-    if 'report' not in st.session_state:
-        st.session_state.report = None
+    if 'report_path' not in st.session_state:
+        st.session_state.report_path = None
     if 'topic' not in st.session_state:
         st.session_state.topic = ""
+    if 'history_page' not in st.session_state:
+        st.session_state.history_page = 0
+    if 'run_id' not in st.session_state:
+        st.session_state.run_id = None
+    if 'client_id' not in st.session_state:
+        # Kept in the URL so a refreshed browser resumes its own runs only
+        st.session_state.client_id = st.query_params.get("client") or uuid.uuid4().hex
+        st.query_params["client"] = st.session_state.client_id
 
 def check_configuration():
     """Check if required configuration is present."""
@@ -86,73 +89,65 @@ def check_configuration():
     except ValueError as e:
         return False, str(e)
 
-def run_research(topic, research_depth):
+# Seconds between status refreshes while a run is in progress
+POLL_INTERVAL = 2
+
+def get_current_run():
     """
-    Execute the multi-agent research workflow.
-    
-    Args:
-        topic (str): Research topic
-        research_depth (str): Depth of research (quick, standard, deep)
-    
-    Returns:
-        str: Final research report
+    Return the handle of the run this session follows, if any.
+
+    The run id is kept in the URL so a refreshed or reconnected browser
+    reattaches to a run that is still executing in the background.
     """
-    try:
-        # Load configuration
-        config = load_config()
-        agent_config = get_agent_config()
-        task_config = get_task_config()
-        
-        # Create status placeholder
-        status_placeholder = st.empty()
-        
-        # Create LLM instance using factory
-        status_placeholder.info("🔧 Initializing AI model...")
-        llm = create_llm(config, temperature=0.5)
-        
-        # Create agents with single LLM instance
-        status_placeholder.info("🔧 Creating specialized agents...")
-        
-        researcher = create_researcher_agent(agent_config, llm)
-        analyzer = create_analyzer_agent(agent_config, llm)
-        writer = create_writer_agent(agent_config, llm)
-        critic = create_critic_agent(agent_config, llm)
-        
-        agents = {
-            'researcher': researcher,
-            'analyzer': analyzer,
-            'writer': writer,
-            'critic': critic
-        }
-        
-        # Create tasks
-        status_placeholder.info("📋 Creating research tasks...")
-        tasks = create_research_tasks(agents, task_config, topic)
-        
-        # Create crew
-        status_placeholder.info("🚀 Assembling research crew...")
-        crew = Crew(
-            agents=list(agents.values()),
-            tasks=tasks,
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        # Execute research
-        status_placeholder.info("🔍 Research in progress... This may take a few minutes.")
-        
-        # Run the crew
-        result = crew.kickoff()
-        
-        status_placeholder.success("✅ Research completed successfully!")
-        
-        return result
-        
-    except Exception as e:
-        st.error(f"Error during research: {str(e)}")
-        import traceback
-        st.error(traceback.format_exc())
+    run_id = st.session_state.get('run_id') or st.query_params.get("run")
+    if not run_id:
         return None
+    st.session_state.run_id = run_id
+    return get_run_manager().get(run_id)
+
+HISTORY_PAGE_SIZE = 10
+
+def render_report_history():
+    """Render a paged, searchable list of archived reports."""
+    st.header("🗂️ Report History")
+    
+    archive = get_report_archive()
+    query = st.text_input("Search past reports:", placeholder="E.g., 'quantum cryptography'")
+    
+    # Reset paging whenever the query changes
+    if st.session_state.get('history_query') != query:
+        st.session_state.history_query = query
+        st.session_state.history_page = 0
+    
+    total = archive.count(query)
+    pages = max(1, (total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE)
+    page = min(st.session_state.history_page, pages - 1)
+    results = archive.search(query, limit=HISTORY_PAGE_SIZE, offset=page * HISTORY_PAGE_SIZE)
+    
+    st.caption(f"{total} report(s) — page {page + 1} of {pages}")
+    
+    for report in results:
+        with st.container():
+            st.markdown(f"**{report['topic']}**  \n"
+                        f"{report['created_at']} · {report['word_count']} words · "
+                        f"{report['source_count']} sources")
+            if report['summary']:
+                st.caption(report['summary'][:300])
+            if report['path'].endswith('.mdz') and st.button("Open", key=f"open_report_{report['id']}"):
+                st.session_state.report_path = report['path']
+                st.session_state.topic = report['topic']
+                st.session_state.research_completed = True
+                st.rerun()
+    
+    prev_col, next_col, _ = st.columns([1, 1, 4])
+    with prev_col:
+        if st.button("⬅️ Previous", disabled=page == 0, use_container_width=True):
+            st.session_state.history_page = page - 1
+            st.rerun()
+    with next_col:
+        if st.button("Next ➡️", disabled=page >= pages - 1, use_container_width=True):
+            st.session_state.history_page = page + 1
+            st.rerun()
 
 def main():
     """Main application function."""
@@ -220,61 +215,121 @@ def main():
                 help="Quick: 5-10 sources, Standard: 10-15 sources, Deep: 15+ sources"
             )
             
+            profile = st.checkbox(
+                "Profile this run",
+                value=False,
+                help="Write a CPU, memory and wait profile next to the report in outputs/"
+            )
+            
+            time_budget = st.number_input(
+                "Time budget (minutes, 0 = none):",
+                min_value=0,
+                max_value=120,
+                value=0,
+                help="Deliver a report within this time, with fewer sources and a shorter report if needed"
+            )
+            
             submit_button = st.form_submit_button("🚀 Start Research", use_container_width=True)
         
         if submit_button and topic:
             st.session_state.topic = topic
             st.session_state.research_completed = False
+            st.session_state.report_path = None
             
-            # Run research
-            with st.spinner("Research in progress..."):
-                result = run_research(topic, research_depth.lower())
-                
-                if result:
-                    st.session_state.report = str(result)
-                    st.session_state.research_completed = True
+            # Start the run in the background and remember it in the URL
+            handle = get_run_manager().submit(topic, research_depth.lower(), profile=profile,
+                                              deadline_seconds=time_budget * 60 or None,
+                                              owner=st.session_state.client_id)
+            st.session_state.run_id = handle.run_id
+            st.query_params["run"] = handle.run_id
+        
+        handle = get_current_run()
+        if handle is not None:
+            if handle.status == "completed" and st.session_state.get('loaded_run') != (handle.run_id, handle.finished_at):
+                # Only the path is kept per session; content is read lazily
+                st.session_state.loaded_run = (handle.run_id, handle.finished_at)
+                st.session_state.topic = handle.topic
+                st.session_state.report_path = handle.report_path
+                st.session_state.research_completed = True
+            elif handle.status == "failed":
+                st.error(f"Error during research: {handle.error}")
+                st.info("Completed steps were saved. Start the same research again to resume where it stopped.")
+            elif not handle.done:
+                status = handle.events[-1]['message'] if handle.events else "⏳ Waiting for a free worker..."
+                st.info(status)
+        elif st.session_state.run_id:
+            st.warning("This research run is no longer active. Start it again to resume from its last completed step.")
+            # Warn once, then stop following the run
+            st.session_state.run_id = None
+            if "run" in st.query_params:
+                del st.query_params["run"]
     
     with col2:
         st.header("📊 Progress")
         
-        if st.session_state.research_completed:
-            st.markdown('<div class="status-box status-completed">✅ Researcher: Completed</div>', unsafe_allow_html=True)
-            st.markdown('<div class="status-box status-completed">✅ Analyzer: Completed</div>', unsafe_allow_html=True)
-            st.markdown('<div class="status-box status-completed">✅ Writer: Completed</div>', unsafe_allow_html=True)
-            st.markdown('<div class="status-box status-completed">✅ Critic: Completed</div>', unsafe_allow_html=True)
-        else:
-            st.markdown('<div class="status-box status-waiting">⏳ Researcher: Waiting</div>', unsafe_allow_html=True)
-            st.markdown('<div class="status-box status-waiting">⏳ Analyzer: Waiting</div>', unsafe_allow_html=True)
-            st.markdown('<div class="status-box status-waiting">⏳ Writer: Waiting</div>', unsafe_allow_html=True)
-            st.markdown('<div class="status-box status-waiting">⏳ Critic: Waiting</div>', unsafe_allow_html=True)
+        completed_tasks = handle.completed_tasks if handle is not None else []
+        running = handle is not None and not handle.done
+        for task_key, agent_key in TASK_AGENTS.items():
+            name = agent_key.capitalize()
+            if st.session_state.research_completed or task_key in completed_tasks:
+                st.markdown(f'<div class="status-box status-completed">✅ {name}: Completed</div>', unsafe_allow_html=True)
+            elif running:
+                st.markdown(f'<div class="status-box status-in-progress">🔄 {name}: In progress</div>', unsafe_allow_html=True)
+                running = False
+            else:
+                st.markdown(f'<div class="status-box status-waiting">⏳ {name}: Waiting</div>', unsafe_allow_html=True)
     
     # Display results
-    if st.session_state.research_completed and st.session_state.report:
+    if st.session_state.research_completed and st.session_state.report_path:
         st.markdown("---")
         st.header("📄 Research Report")
         
+        reader = open_report(st.session_state.report_path)
+        titles = reader.titles
+        
+        # Render one section at a time, defaulting to the final output
+        section = st.selectbox(
+            "Section:",
+            options=list(range(len(titles))),
+            index=len(titles) - 1,
+            format_func=lambda i: titles[i]
+        )
+        
         # Action buttons
         col1, col2, col3 = st.columns([1, 1, 4])
         
         with col1:
             if st.button("📥 Download Report", use_container_width=True):
-                # Save report
-                filepath = save_report(st.session_state.report, st.session_state.topic)
+                # Export the stored report as markdown
+                filepath = reader.export_markdown()
                 st.success(f"Report saved to: {filepath}")
         
         with col2:
-            if st.button("📋 Copy to Clipboard", use_container_width=True):
-                st.code(st.session_state.report, language="markdown")
+            copy_clicked = st.button("📋 Copy to Clipboard", use_container_width=True)
+        
+        content = reader.read_section(section)
+        
+        if copy_clicked:
+            st.code(content, language="markdown")
         
         # Display report
         with st.container():
             st.markdown('<div class="report-section">', unsafe_allow_html=True)
-            st.markdown(st.session_state.report)
+            st.markdown(content)
             st.markdown('</div>', unsafe_allow_html=True)
         
         # Show raw markdown in expander
         with st.expander("📝 View Raw Markdown"):
-            st.code(st.session_state.report, language="markdown")
+            st.code(content, language="markdown")
+    
+    # Past reports
+    st.markdown("---")
+    render_report_history()
+    
+    # Poll the background run until it finishes
+    if handle is not None and not handle.done:
+        time.sleep(POLL_INTERVAL)
+        st.rerun()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,43 @@
+"""Resume tokens are only accepted for checkpoints of the same research."""
+
+import pytest
+
+from src.utils.checkpoint import CheckpointStore, make_run_id, purge_expired_checkpoints
+
+
+@pytest.mark.parametrize("run_id", ["../../src", "..", "/tmp", "abc/../def", "0123456789ABCDEF", ""])
+def test_traversal_and_malformed_ids_are_rejected(tmp_path, run_id):
+    with pytest.raises(ValueError):
+        CheckpointStore(run_id, tmp_path)
+
+
+def test_unknown_id_does_not_match(tmp_path):
+    store = CheckpointStore(make_run_id("Battery recycling"), tmp_path)
+    assert not store.matches("Battery recycling", "standard")
+    assert store.load() == {}
+
+
+def test_checkpoint_matches_its_own_topic_and_depth(tmp_path):
+    run_id = make_run_id("Battery recycling")
+    CheckpointStore(run_id, tmp_path).save("research", "findings", topic="Battery recycling",
+                                           research_depth="standard")
+    store = CheckpointStore(run_id, tmp_path)
+    assert store.matches("battery  recycling", "standard")
+    assert not store.matches("Battery recycling", "deep")
+    assert not store.matches("Solid-state batteries", "standard")
+    assert store.load() == {'research': "findings"}
+
+
+def test_purge_ignores_foreign_directories(tmp_path):
+    (tmp_path / "not-a-run").mkdir()
+    assert purge_expired_checkpoints(tmp_path, ttl_hours=0) == 0
+    assert (tmp_path / "not-a-run").is_dir()
+
+
+def test_submit_rejects_traversal_resume_ids():
+    from src.runs.manager import RunManager
+
+    manager = RunManager(max_workers=1)
+    with pytest.raises(ValueError):
+        manager.submit("Battery recycling", "standard", resume="../../src")
+    assert manager.list_runs() == []
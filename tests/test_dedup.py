@@ -0,0 +1,109 @@
+"""Near-duplicate detection on realistic page variants."""
+
+import random
+
+from src.tools.dedup import ContentDeduplicator, FALLBACK_MAX_PAGES, get_deduplicator
+
+ARTICLE = """
+Grid-scale battery storage has grown faster than almost any other part of the
+power sector over the past five years. Developers installed more than 40
+gigawatts of new capacity in 2023, most of it lithium iron phosphate systems
+paired with solar farms in California, Texas and Australia. The economics
+changed quickly once cell prices fell below 140 dollars per kilowatt hour,
+which made four-hour systems competitive with gas peaker plants that run only
+a few hundred hours a year. Operators now use batteries to shift midday solar
+output into the evening ramp, to provide frequency response within
+milliseconds, and to defer expensive upgrades of congested transmission lines.
+Critics point out that most installations still discharge for four hours or
+less, which does little to cover multi-day lulls in wind generation during
+winter. Long-duration alternatives such as iron-air cells, compressed air in
+salt caverns and pumped hydro are being tested, but their costs remain
+uncertain and few projects have reached commercial operation. Regulators are
+also revising market rules, because storage can act as generation and load at
+the same time and many tariffs were written before that was possible. In
+Germany the network agency exempted new batteries from grid fees until 2029,
+while the Texas market operator introduced a real-time co-optimization of
+energy and reserves. Analysts expect annual installations to double again by
+2026 if supply chains for cathode materials hold up and interconnection
+queues are shortened.
+"""
+
+UNRELATED = """
+Vertical farming companies promised to grow lettuce and herbs next to the
+cities that eat them, using stacked trays under LED lighting and a fraction of
+the water needed in open fields. After a wave of venture funding between 2019
+and 2021, several of the best known start-ups filed for bankruptcy when
+electricity prices rose and investors asked for a path to profit. The
+survivors have narrowed their focus to high-value crops such as strawberries,
+microgreens and seedlings for conventional growers, and many now sign
+long-term power purchase agreements to fix their energy costs. Researchers at
+Wageningen University estimate that lighting accounts for more than half of
+operating expenses, so improvements in diode efficiency and crop genetics
+matter more than automation. Supermarkets remain cautious buyers: shelf life is
+longer and pesticide use is nil, but shoppers are rarely willing to pay a
+premium large enough to cover the capital cost of the buildings.
+"""
+
+SITE_HEADER = (
+    "Energy Monitor Daily Home News Analysis Data Podcasts Events Subscribe Sign in "
+    "Newsletter Get the latest analysis delivered to your inbox every morning free"
+)
+SITE_FOOTER = (
+    "About us Contact Advertise Privacy policy Cookie settings Terms of use All rights "
+    "reserved Follow us on LinkedIn and X Share this article with a colleague today"
+)
+
+
+def _edit_words(text, count, seed=0):
+    rng = random.Random(seed)
+    words = text.split()
+    for position in rng.sample(range(len(words)), count):
+        words[position] = rng.choice(["however", "notably", "reportedly", "roughly", "recent"])
+    return " ".join(words)
+
+
+def _variants(text):
+    return {
+        "header": f"{SITE_HEADER} {text}",
+        "footer": f"{text} {SITE_FOOTER}",
+        "header_and_footer": f"{SITE_HEADER} {text} {SITE_FOOTER}",
+        "edited": _edit_words(text, 10),
+        "edited_and_wrapped": f"{SITE_HEADER} {_edit_words(text, 10, seed=1)} {SITE_FOOTER}",
+    }
+
+
+def test_realistic_variants_are_near_duplicates():
+    for name, variant in _variants(ARTICLE).items():
+        deduplicator = ContentDeduplicator()
+        assert deduplicator.add_page("https://energy.example/batteries", ARTICLE) is None
+        assert deduplicator.add_page(f"https://mirror.example/{name}", variant) == \
+            "https://energy.example/batteries", name
+
+
+def test_unrelated_pages_with_shared_boilerplate_are_kept():
+    deduplicator = ContentDeduplicator()
+    page = f"{SITE_HEADER} {ARTICLE} {SITE_FOOTER}"
+    other = f"{SITE_HEADER} {UNRELATED} {SITE_FOOTER}"
+    assert deduplicator.add_page("https://energy.example/batteries", page) is None
+    assert deduplicator.add_page("https://energy.example/farming", other) is None
+    assert len(deduplicator.pages) == 2
+
+
+def test_url_variants_are_skipped_before_fetching():
+    deduplicator = ContentDeduplicator()
+    deduplicator.add_page("https://www.energy.example/batteries?utm_source=feed", ARTICLE)
+    assert deduplicator.seen_url("http://energy.example/amp/batteries#top") == \
+        "https://www.energy.example/batteries?utm_source=feed"
+
+
+def test_bounded_deduplicator_forgets_oldest_pages():
+    deduplicator = ContentDeduplicator(max_pages=2)
+    deduplicator.add_page("https://a.example/", ARTICLE)
+    deduplicator.add_page("https://b.example/", UNRELATED)
+    deduplicator.add_page("https://c.example/", "A third page about something else entirely.")
+    assert list(deduplicator.pages) == ["https://b.example/", "https://c.example/"]
+    assert deduplicator.seen_url("https://a.example/") is None
+
+
+def test_fallback_outside_a_run_is_bounded():
+    assert get_deduplicator().max_pages == FALLBACK_MAX_PAGES
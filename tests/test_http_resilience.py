@@ -0,0 +1,49 @@
+"""Hedging never turns healthy-but-busy fetches into host failures."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from src.tools import http_resilience
+from src.tools.http_resilience import HostRegistry, call_with_resilience
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = HostRegistry(max_failures=3, cooldown=60)
+    monkeypatch.setattr(http_resilience, '_registry', registry)
+    monkeypatch.setenv("SCRAPE_HEDGE", "true")
+    monkeypatch.setenv("SCRAPE_HEDGE_DELAY", "0.3")
+    monkeypatch.setenv("SCRAPE_TIMEOUT", "1")
+    monkeypatch.setenv("SCRAPE_RETRIES", "0")
+    return registry
+
+
+def test_concurrent_healthy_fetches_open_no_circuit(registry):
+    def fetch(timeout):
+        time.sleep(0.6)
+        if timeout < 0.6:
+            raise requests.exceptions.Timeout("slow host")
+        return "page"
+
+    with ThreadPoolExecutor(max_workers=24) as pool:
+        results = list(pool.map(lambda i: call_with_resilience("https://example.com/page", fetch), range(24)))
+
+    assert results == ["page"] * 24
+    assert registry.stats()['open_hosts'] == []
+
+
+def test_hedge_result_is_used_when_the_attempt_fails(registry):
+    calls = []
+
+    def fetch(timeout):
+        calls.append(timeout)
+        if len(calls) == 1:
+            time.sleep(0.5)
+            raise requests.exceptions.ConnectionError("connection reset")
+        return "page"
+
+    assert call_with_resilience("https://example.org/page", fetch) == "page"
+    assert registry.stats()['hedge_wins'] == 1
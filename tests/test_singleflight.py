@@ -0,0 +1,54 @@
+"""Followers of a coalesced call never hang on, or silently lose, its outcome."""
+
+import threading
+import time
+
+import pytest
+
+from src.utils.cancellation import StepCancelled
+from src.utils.singleflight import SingleFlight, LeaderAborted
+
+
+def _run_with_follower(flight, leader_fn):
+    outcome = {}
+
+    def follow():
+        try:
+            outcome['result'] = flight.do("key", lambda: "follower did the work")
+        except BaseException as e:
+            outcome['error'] = e
+
+    follower = threading.Thread(target=follow)
+
+    def lead():
+        follower.start()
+        deadline = time.time() + 5
+        while flight.coalesced == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        return leader_fn()
+
+    return lead, follower, outcome
+
+
+def test_follower_gets_leader_result():
+    flight = SingleFlight("test")
+    lead, follower, outcome = _run_with_follower(flight, lambda: "leader result")
+    assert flight.do("key", lead) == "leader result"
+    follower.join(5)
+    assert outcome == {'result': "leader result"}
+    assert flight.executions == 1
+
+
+def test_cancelled_leader_aborts_followers_without_cancelling_them():
+    flight = SingleFlight("test")
+
+    def cancelled():
+        raise StepCancelled("run deadline passed")
+
+    lead, follower, outcome = _run_with_follower(flight, cancelled)
+    with pytest.raises(StepCancelled):
+        flight.do("key", lead)
+    follower.join(5)
+    assert not follower.is_alive()
+    assert isinstance(outcome.get('error'), LeaderAborted)
+    assert isinstance(outcome['error'].__cause__, StepCancelled)